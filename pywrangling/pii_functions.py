@@ -112,10 +112,11 @@ def unshuffle_column_values(shuffled_values, seed=None):
 
 
 # %% Example usage
-seed = 42
-ethnicities = ["Asian", "White", "Black", "Hispanic", "White", "Asian", "Black"]
+if __name__ == "__main__":
+    seed = 42
+    ethnicities = ["Asian", "White", "Black", "Hispanic", "White", "Asian", "Black"]
 
-shuffled_ethnicities = shuffle_column_values(ethnicities, seed=seed)
-unshuffled_ethnicities = unshuffle_column_values(shuffled_ethnicities, seed=seed)
+    shuffled_ethnicities = shuffle_column_values(ethnicities, seed=seed)
+    unshuffled_ethnicities = unshuffle_column_values(shuffled_ethnicities, seed=seed)
 
-shuffled_ethnicities, unshuffled_ethnicities
\ No newline at end of file
+    print(shuffled_ethnicities, unshuffled_ethnicities)
\ No newline at end of file
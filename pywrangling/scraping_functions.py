@@ -7,6 +7,7 @@ These functions are designed to add utility to web scraping work.
 import time  # Time-related functions
 import warnings  # Warnings control
 import random  # Generate random numbers
+import os  # Environment variables
 
 # Data Manipulation Libraries
 import pandas as pd  # Data manipulation and analysis
@@ -49,6 +50,10 @@ import jwt
 from datetime import datetime, timedelta
 
 
+# Set PYWRANGLING_HIGHLIGHT=0 to make find_and_highlight a no-op, e.g. for production scraping runs
+HIGHLIGHT_ENABLED = os.environ.get('PYWRANGLING_HIGHLIGHT', '1') != '0'
+
+
 # %% Functions
 
 def find_and_highlight(element, wait_time=10, background_color="yellow", border_color="red"):
@@ -57,6 +62,8 @@ def find_and_highlight(element, wait_time=10, background_color="yellow", border_
 
     This function is used for web scraping. It temporarily changes the style of a web element to make it visually stand out.
     The function assumes that the element is part of a Selenium WebDriver browser instance.
+    When the PYWRANGLING_HIGHLIGHT environment variable is set to 0, the element is returned straight away
+    without waiting or highlighting, so batch scraping code can keep the call without paying for it.
 
     Parameters:
     - element (selenium.webdriver.remote.webelement.WebElement): The web element to be highlighted.
@@ -79,28 +86,25 @@ def find_and_highlight(element, wait_time=10, background_color="yellow", border_
     find_and_highlight(elem, background_color="green", border_color="blue")  # highlight the search box with custom colors
     ```
     """
-    
+    if not HIGHLIGHT_ENABLED:
+        return element
+
     # Wait until the element is present and visible
     browser = element._parent
     WebDriverWait(browser, wait_time).until(EC.visibility_of(element))
     
-    # Define a function to apply a style to the element
-    def apply_style(s):
-        browser.execute_script("arguments[0].setAttribute('style', arguments[1]);", element, s)
-
-    # Save the element's original style
-    original_style = element.get_attribute('style')
-
-    # Apply the highlight style
+    # Define the highlight style
     highlight_style = f"background: {background_color} !important; border: 2px solid {border_color} !important;"
 
-    apply_style(highlight_style)
-
-    # Pause for a moment to let the highlight be seen
-    time.sleep(.3)
-
-    # Revert to the original style
-    apply_style(original_style)
+    # Apply the highlight and let the browser revert it after a moment, so this is one round-trip to the
+    # driver and Python doesn't sit idle while the highlight is shown
+    browser.execute_script(
+        "var element = arguments[0], original = element.getAttribute('style');"
+        "element.setAttribute('style', arguments[1]);"
+        "setTimeout(function () {"
+        "  if (original === null) { element.removeAttribute('style'); } else { element.setAttribute('style', original); }"
+        "}, arguments[2]);",
+        element, highlight_style, 300)
 
     # Return the element
     return element
@@ -1,6 +1,3 @@
-# TODO: The number of rows replaced needs correction
-
-
 """
 This library provides a set of functions designed to simplify common data
 wrangling tasks.
@@ -13,10 +10,70 @@ import pandas as pd  # Main library for data manipulation
 import numpy as np  # Library for numerical operations
 import re  # Regular expressions library for string manipulation
 import math
+import itertools
+import os
+import string  # capwords for proper_case
+import ast  # Parsing of condition strings into expression trees
+import logging
+from functools import lru_cache
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor
+
+# numba is optional; without it the pandas eval path is used everywhere
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+logger = logging.getLogger(__name__)
+
+
+
+def _copy_unless_cow(df):
+    """
+    Copy a DataFrame so that changes to the copy never reach the original.
+
+    With pandas' copy-on-write mode on, a shallow copy already guarantees that and the data is only copied
+    when one side is modified; otherwise a shallow copy would share (and let writes through to) the
+    original's data, so a full copy is made.
+    """
+    if pd.get_option('mode.copy_on_write') is True:
+        return df.copy(deep=False)
+    return df.copy()
+
+
+def _shrink(df, columns=None, cat_thresh=0.5):
+    """
+    Downcast columns of a DataFrame to the smallest dtype that holds their values.
+
+    Integer columns become the smallest (unsigned, if non-negative) integer type, float columns
+    become float32 where possible, and object columns with few unique values become 'category'.
+    The DataFrame is modified in place and returned.
+
+    Parameters:
+    df (pd.DataFrame): DataFrame to shrink
+    columns (list of str, optional): Columns to consider. Defaults to all columns.
+    cat_thresh (float, optional): Object columns whose unique/total ratio is below this become categorical. Defaults to 0.5.
+
+    Returns:
+    pd.DataFrame: The same DataFrame with downcast dtypes
+    """
+    sub = df if columns is None else df[columns]
+
+    for c in sub.select_dtypes('integer').columns:
+        df[c] = pd.to_numeric(df[c], downcast='unsigned' if df[c].min() >= 0 else 'integer')
+    for c in sub.select_dtypes('float').columns:
+        df[c] = pd.to_numeric(df[c], downcast='float')
+    if len(df):
+        for c in sub.select_dtypes('object').columns:
+            if df[c].nunique() / len(df) < cat_thresh:
+                df[c] = df[c].astype('category')
+
+    return df
 
 
 
-def rename_columns(df, old_names, new_names=None, prefix=None, suffix=None, remove_prefix=None, remove_suffix=None):
+def rename_columns(df, old_names, new_names=None, prefix=None, suffix=None, remove_prefix=None, remove_suffix=None, is_regex=False):
     """
     Rename columns in a DataFrame.
 
@@ -26,8 +83,9 @@ def rename_columns(df, old_names, new_names=None, prefix=None, suffix=None, remo
     new_names (list of str, optional): List of new column names
     prefix (str, optional): Prefix to add to new column names
     suffix (str, optional): Suffix to add to new column names
-    remove_prefix (str, optional): Prefix to remove from column names
-    remove_suffix (str, optional): Suffix to remove from column names
+    remove_prefix (str, optional): Prefix to remove from column names (matched literally unless is_regex is True)
+    remove_suffix (str, optional): Suffix to remove from column names (matched literally unless is_regex is True)
+    is_regex (bool, optional): If True, remove_prefix and remove_suffix are regular expressions. Defaults to False.
 
     Returns:
     pd.DataFrame: Modified DataFrame with renamed columns
@@ -94,17 +152,24 @@ def rename_columns(df, old_names, new_names=None, prefix=None, suffix=None, remo
     if not new_names:
         new_names = old_names
 
-    # Remove prefix or suffix if provided
-    if remove_prefix:
-        new_names = [re.sub(f'^{remove_prefix}', '', name) for name in new_names]
-    if remove_suffix:
-        new_names = [re.sub(f'{remove_suffix}$', '', name) for name in new_names]
-
-    # Add prefix or suffix if provided
-    if prefix:
-        new_names = [prefix + name for name in new_names]
-    if suffix:
-        new_names = [name + suffix for name in new_names]
+    # Remove and then add prefix or suffix if provided, in a single pass over the names
+    if remove_prefix or remove_suffix or prefix or suffix:
+        # Regex patterns are compiled once rather than looked up again for every name
+        prefix_re = re.compile(f'^(?:{remove_prefix})') if is_regex and remove_prefix else None
+        suffix_re = re.compile(f'(?:{remove_suffix})$') if is_regex and remove_suffix else None
+
+        def edit_name(name):
+            if prefix_re is not None:
+                name = prefix_re.sub('', name, count=1)
+            elif remove_prefix and name.startswith(remove_prefix):
+                name = name[len(remove_prefix):]
+            if suffix_re is not None:
+                name = suffix_re.sub('', name, count=1)
+            elif remove_suffix and name.endswith(remove_suffix):
+                name = name[:-len(remove_suffix)]
+            return (prefix or '') + name + (suffix or '')
+
+        new_names = [edit_name(name) for name in new_names]
 
     # Create a dictionary mapping old names to new names
     rename_dict = dict(zip(old_names, new_names))
@@ -133,41 +198,362 @@ def move_column(df, col_to_move, pos='last', ref_col=None):
     Returns:
     pd.DataFrame: Modified DataFrame
     """
-    # Make a list of all columns in the DataFrame
-    cols = df.columns.tolist()
-
-    # Remove the column to be moved from the list
-    cols.remove(col_to_move)
-
-    # Check the desired position and adjust the list of columns accordingly
+    # Work with column positions rather than a list of names, so finding a column is a hash lookup
+    # instead of a list scan and the result is a single positional take
+    def first_position(columns, label):
+        positions = columns.get_indexer_for([label])
+        positions = positions[positions != -1]
+        if not len(positions):
+            raise ValueError(f"{label!r} is not in list")
+        return positions.min()
+
+    # Remove the column to be moved from the order
+    moving = first_position(df.columns, col_to_move)
+    order = np.delete(np.arange(len(df.columns)), moving)
+
+    # Check the desired position and find where in the remaining columns to insert it
     if pos == 'first':
-        # If 'first', add the column to the start of the list
-        cols = [col_to_move] + cols
+        at = 0
     elif pos == 'last':
-        # If 'last' (or unspecified), add the column to the end of the list
-        cols = cols + [col_to_move]
-    elif pos == 'before' and ref_col:
-        # If 'before' and a reference column is specified, find the index of the reference column
-        # and insert the column to be moved before it
-        idx = cols.index(ref_col)
-        cols = cols[:idx] + [col_to_move] + cols[idx:]
-    elif pos == 'after' and ref_col:
-        # Similar to 'before', but insert the column to be moved after the reference column
-        idx = cols.index(ref_col)
-        cols = cols[:idx + 1] + [col_to_move] + cols[idx + 1:]
+        at = len(order)
+    elif pos in ('before', 'after') and ref_col:
+        # Insert before or after the reference column
+        at = first_position(df.columns.take(order), ref_col) + (pos == 'after')
     elif isinstance(pos, int):
         # If an integer is given, insert the column to be moved at that position
-        # (assuming that the position is 1-indexed as in Stata, hence the -1)
-        cols = cols[:pos - 1] + [col_to_move] + cols[pos - 1:]
+        # (assuming that the position is 1-indexed as in Stata, hence the -1; out-of-range values clip like a slice)
+        at = len(order[:pos - 1])
+    else:
+        # Unrecognized positions leave the column out, as before
+        return df.take(order, axis=1)
 
     # Create a new DataFrame with the columns in the desired order
-    return df[cols]
+    return df.take(np.insert(order, at, moving), axis=1)
+
+
+# ##############################################################################
+# Numba kernel used by replace() for purely numeric conditions
+# ##############################################################################
+
+# Below this many rows numexpr is fast enough that JIT dispatch isn't worth it
+_NUMBA_MIN_ROWS = 10_000
+
+# Patterns for replace()'s 'n' notation, compiled once: a whole reference like x[n-1], and just its offset
+_N_REFERENCE_RE = re.compile(r'(\w+\[n[+-]?\d+\])')
+_N_OFFSET_RE = re.compile(r'\[n([+-]?\d+)\]')
+# Equality tests against quoted words, normalized before handing the condition to eval
+_QUOTED_EQUALS_RE = re.compile(r"\s*==\s*'(\w+)'\s*")
+
+# Opcodes of the postfix "tape" a condition string is compiled into
+_OP_COL, _OP_CONST = 0, 1
+_OP_ADD, _OP_SUB, _OP_MUL, _OP_DIV = 2, 3, 4, 5
+_OP_LT, _OP_LE, _OP_GT, _OP_GE, _OP_EQ, _OP_NE = 6, 7, 8, 9, 10, 11
+_OP_AND, _OP_OR, _OP_NOT, _OP_NEG = 12, 13, 14, 15
+
+_BINOPS = {ast.Add: _OP_ADD, ast.Sub: _OP_SUB, ast.Mult: _OP_MUL, ast.Div: _OP_DIV}
+_CMPOPS = {ast.Lt: _OP_LT, ast.LtE: _OP_LE, ast.Gt: _OP_GT, ast.GtE: _OP_GE, ast.Eq: _OP_EQ, ast.NotEq: _OP_NE}
+
+
+@lru_cache(maxsize=256)
+def _compile_condition_tape(condition_string):
+    """
+    Compile a numeric condition string into a postfix tape for the numba kernel.
+
+    Only names, numeric constants, + - * /, comparisons and &, |, ~ (or and, or, not) are supported.
+
+    Parameters:
+    condition_string (str): Condition with any [n+k] references already translated to column names
 
+    Returns:
+    tuple or None: (ops, args, names, consts, depth) or None if the condition can't be compiled
+    """
+    # pandas.eval gives & and | the precedence of 'and'/'or', so rewrite them the same way
+    if any(q in condition_string for q in ('"', "'", '@')):
+        return None
+    try:
+        tree = ast.parse(condition_string.replace('&', ' and ').replace('|', ' or '), mode='eval').body
+    except SyntaxError:
+        return None
+
+    ops, args, names, consts = [], [], [], []
+
+    # Emit instructions for a node; returns True if the node yields a boolean, False if numeric
+    def emit(node):
+        if isinstance(node, ast.Name):
+            if node.id not in names:
+                names.append(node.id)
+            ops.append(_OP_COL)
+            args.append(names.index(node.id))
+            return False
+        if isinstance(node, ast.Constant) and isinstance(node.value, (bool, int, float)):
+            consts.append(float(node.value))
+            ops.append(_OP_CONST)
+            args.append(len(consts) - 1)
+            return isinstance(node.value, bool)
+        if isinstance(node, ast.BinOp) and type(node.op) in _BINOPS:
+            if emit(node.left) or emit(node.right):
+                raise ValueError
+            ops.append(_BINOPS[type(node.op)])
+            args.append(0)
+            return False
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.Not, ast.Invert)):
+            if not emit(node.operand):
+                raise ValueError  # ~ on a number is a bitwise op, not a logical one
+            ops.append(_OP_NOT)
+            args.append(0)
+            return True
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+            if emit(node.operand):
+                raise ValueError
+            ops.append(_OP_NEG)
+            args.append(0)
+            return False
+        if isinstance(node, ast.BoolOp):
+            op = _OP_AND if isinstance(node.op, ast.And) else _OP_OR
+            for i, value in enumerate(node.values):
+                if not emit(value):
+                    raise ValueError
+                if i:
+                    ops.append(op)
+                    args.append(0)
+            return True
+        if isinstance(node, ast.Compare) and all(type(o) in _CMPOPS for o in node.ops):
+            # Chained comparisons (a < b < c) expand to (a < b) and (b < c)
+            left = node.left
+            for i, (cmp_op, right) in enumerate(zip(node.ops, node.comparators)):
+                emit(left)
+                emit(right)
+                ops.append(_CMPOPS[type(cmp_op)])
+                args.append(0)
+                if i:
+                    ops.append(_OP_AND)
+                    args.append(0)
+                left = right
+            return True
+        raise ValueError
+
+    try:
+        if not emit(tree):
+            return None
+    except ValueError:
+        return None
+
+    # Maximum stack depth reached while running the tape
+    depth = max_depth = 0
+    for op in ops:
+        depth += 1 if op in (_OP_COL, _OP_CONST) else (0 if op in (_OP_NOT, _OP_NEG) else -1)
+        max_depth = max(max_depth, depth)
+
+    return tuple(ops), tuple(args), tuple(names), tuple(consts), max_depth
+
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _eval_condition_tape(ops, args, data, shifts, consts, depth):
+        """Evaluate a compiled condition tape for every row, reading shifted values in place."""
+        n = data.shape[1]
+        out = np.zeros(n, dtype=np.bool_)
+        chunk = 4096
+        for c in prange((n + chunk - 1) // chunk):
+            stack = np.empty(depth)
+            for i in range(c * chunk, min(n, (c + 1) * chunk)):
+                sp = 0
+                for k in range(ops.shape[0]):
+                    op = ops[k]
+                    if op == _OP_COL:
+                        j = i + shifts[args[k]]
+                        stack[sp] = data[args[k], j] if 0 <= j < n else np.nan
+                        sp += 1
+                    elif op == _OP_CONST:
+                        stack[sp] = consts[args[k]]
+                        sp += 1
+                    elif op == _OP_NOT:
+                        stack[sp - 1] = 0.0 if stack[sp - 1] != 0.0 else 1.0
+                    elif op == _OP_NEG:
+                        stack[sp - 1] = -stack[sp - 1]
+                    else:
+                        b = stack[sp - 1]
+                        a = stack[sp - 2]
+                        sp -= 1
+                        if op == _OP_ADD:
+                            r = a + b
+                        elif op == _OP_SUB:
+                            r = a - b
+                        elif op == _OP_MUL:
+                            r = a * b
+                        elif op == _OP_DIV:
+                            r = a / b
+                        elif op == _OP_LT:
+                            r = 1.0 if a < b else 0.0
+                        elif op == _OP_LE:
+                            r = 1.0 if a <= b else 0.0
+                        elif op == _OP_GT:
+                            r = 1.0 if a > b else 0.0
+                        elif op == _OP_GE:
+                            r = 1.0 if a >= b else 0.0
+                        elif op == _OP_EQ:
+                            r = 1.0 if a == b else 0.0
+                        elif op == _OP_NE:
+                            r = 1.0 if a != b else 0.0
+                        elif op == _OP_AND:
+                            r = 1.0 if (a != 0.0 and b != 0.0) else 0.0
+                        else:
+                            r = 1.0 if (a != 0.0 or b != 0.0) else 0.0
+                        stack[sp - 1] = r
+                out[i] = stack[0] != 0.0
+        return out
+
+
+_NUMEXPR_SYMBOLS = {ast.Add: '+', ast.Sub: '-', ast.Mult: '*', ast.Div: '/', ast.Lt: '<', ast.LtE: '<=',
+                    ast.Gt: '>', ast.GtE: '>=', ast.Eq: '==', ast.NotEq: '!=', ast.And: '&', ast.Or: '|'}
+
+
+@lru_cache(maxsize=256)
+def _numexpr_condition(condition_string):
+    """
+    Rewrite a numeric condition as a numexpr expression over the variables v0, v1, ...
+    (one per name of the compiled tape, in order).
+
+    Parameters:
+    condition_string (str): Condition with any [n+k] references already translated to column names
+
+    Returns:
+    str or None: The numexpr expression, or None if the condition can't be compiled
+    """
+    # The tape compiler checks that only supported, well-typed syntax is used
+    tape = _compile_condition_tape(condition_string)
+    if tape is None:
+        return None
+    names = tape[2]
+    tree = ast.parse(condition_string.replace('&', ' and ').replace('|', ' or '), mode='eval').body
+
+    # Constants are written as in the condition, so integers stay integers as they do in pandas eval
+    def render(node):
+        if isinstance(node, ast.Name):
+            return f'v{names.index(node.id)}'
+        if isinstance(node, ast.Constant):
+            return repr(node.value)
+        if isinstance(node, ast.BinOp):
+            return f'({render(node.left)} {_NUMEXPR_SYMBOLS[type(node.op)]} {render(node.right)})'
+        if isinstance(node, ast.UnaryOp):
+            return f'({"-" if isinstance(node.op, ast.USub) else "~"}{render(node.operand)})'
+        if isinstance(node, ast.BoolOp):
+            return '(' + f' {_NUMEXPR_SYMBOLS[type(node.op)]} '.join(render(value) for value in node.values) + ')'
+        # Chained comparisons (a < b < c) expand to (a < b) & (b < c)
+        operands = [node.left] + node.comparators
+        return '(' + ' & '.join(f'({render(left)} {_NUMEXPR_SYMBOLS[type(op)]} {render(right)})'
+                                for left, op, right in zip(operands, node.ops, operands[1:])) + ')'
+
+    return render(tree)
+
+
+def _exact_in_float64(series):
+    """Whether every value of a numeric Series converts to float64 exactly (only 64-bit integers may not)."""
+    dtype = series.dtype
+    if dtype.kind not in 'iu' or dtype.itemsize < 8:
+        return True
+    low, high = series.min(), series.max()
+    return pd.isna(low) or (-2**53 <= low and high <= 2**53)
+
+
+def _numeric_condition_mask(df, condition_string, shift_dict):
+    """
+    Evaluate a purely numeric condition without pandas.eval: with the numba kernel on large frames, which
+    fuses the [n+k] shifts into the row loop, or else with numexpr on just the columns the condition uses.
+
+    Parameters:
+    df (pd.DataFrame): DataFrame the condition refers to
+    condition_string (str): Condition with [n+k] references translated to shifted column names
+    shift_dict (dict): Mapping of original 'col[n+k]' references to their shifted column names
+
+    Returns:
+    pd.Series or None: Boolean mask, or None if the condition isn't eligible (or neither numba nor numexpr
+        is installed)
+    """
+    tape = _compile_condition_tape(condition_string)
+    if tape is None:
+        return None
+    ops, args, names, consts, depth = tape
+    if not names:
+        return None  # A constant condition isn't a row mask
+
+    # Resolve each name to a source column and a row offset
+    shifted = {shifted_col_name: (original.split('[')[0], int(_N_OFFSET_RE.findall(original)[0]))
+               for original, shifted_col_name in shift_dict.items()}
+    sources = []
+    for name in names:
+        col, offset = shifted.get(name, (name, 0))
+        if col not in df.columns or not pd.api.types.is_numeric_dtype(df[col]):
+            return None
+        sources.append((col, offset))
+
+    # The numba kernel works in float64, which can't hold 64-bit integers beyond 2**53 exactly, so
+    # conditions reading such values go to numexpr, which keeps int64 as int64. uint64 and nullable
+    # 64-bit integers would be floats there too, so those are left to pandas eval.
+    inexact = [df[col].dtype for col in {col for col, _ in sources} if not _exact_in_float64(df[col])]
+    if any(not isinstance(dtype, np.dtype) or dtype.kind == 'u' for dtype in inexact):
+        return None
+    use_numba = njit is not None and len(df) >= _NUMBA_MIN_ROWS and not inexact
+    if not use_numba:
+        try:
+            import numexpr
+        except ImportError:
+            return None
+
+    if not use_numba:
+        local_dict = {}
+        for i, (col, offset) in enumerate(sources):
+            # x[n+k] reads the value k rows further down, as in the pandas eval path
+            values = df[col].shift(-offset) if offset else df[col]
+            dtype = values.dtype
+            if isinstance(dtype, np.dtype) and (dtype.kind in 'bi' or (dtype.kind == 'u' and dtype.itemsize < 8)):
+                # Keep integers as integers, as pandas does (e.g. -0 stays 0 rather than becoming -0.0)
+                local_dict[f'v{i}'] = values.to_numpy(dtype=np.int64)
+            else:
+                local_dict[f'v{i}'] = values.to_numpy(dtype=np.float64, na_value=np.nan)
+        try:
+            mask = numexpr.evaluate(_numexpr_condition(condition_string), local_dict=local_dict)
+        except (ZeroDivisionError, TypeError, OverflowError):
+            return None  # numexpr folds constant parts such as 1 / 0 in Python; leave those to pandas eval
+        return pd.Series(mask, index=df.index)
+
+    data = np.empty((len(sources), len(df)))
+    for i, (col, _) in enumerate(sources):
+        data[i] = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+    shifts = np.array([offset for _, offset in sources], dtype=np.int64)
+
+    mask = _eval_condition_tape(np.array(ops, dtype=np.int64), np.array(args, dtype=np.int64),
+                                data, shifts, np.array(consts, dtype=np.float64), depth)
+    return pd.Series(mask, index=df.index)
+
+
+
+
+@lru_cache(maxsize=256)
+def _translate_n_to_shifted_col_names(condition):
+    """
+    Translate 'n' notation (e.g. 'x[n-1]') in a condition to shifted column names (e.g. 'x_shifted_m1').
+
+    Cached, since replace() is often called repeatedly with the same condition.
+
+    Parameters:
+    condition (str): Condition string using 'n' notation
+
+    Returns:
+    tuple: The translated condition and a tuple of (original, shifted column name) pairs
+    """
+    bracket_contents = _N_OFFSET_RE.findall(condition)
+    groups = _N_REFERENCE_RE.findall(condition)
+    shift_dict = {group: group.split('[')[0] + '_shifted_' + bracket_content.replace('-', 'm').replace('+', '')
+                  for group, bracket_content in zip(groups, bracket_contents)}
+    for group, shifted_col_name in shift_dict.items():
+        condition = condition.replace(group, shifted_col_name)
+    return condition, tuple(shift_dict.items())
 
 
 
 
-def replace(df, column, new_value, condition):
+def replace(df, column, new_value, condition, inplace=False):
     """
     Function to replicate Stata's replace functionality.
 
@@ -176,46 +562,54 @@ def replace(df, column, new_value, condition):
     column: str, column name to be modified
     new_value: str or value, new value (could be a column name or a constant value, with optional 'n' notation for shift)
     condition: str, condition to be applied on the column
+    inplace: bool, if True, modify df itself rather than a copy of it. Defaults to False.
 
     Returns:
-    pandas.DataFrame: Modified DataFrame with replaced values according to the condition
+    pandas.DataFrame: Modified DataFrame with replaced values according to the condition. The original
+        DataFrame is left unchanged unless inplace is True.
     """
     
-    # Making a deep copy of the DataFrame to ensure the original DataFrame remains unchanged
-    df = df.copy()
-
-    # Function to translate 'n' notation to shifted column names
-    def translate_n_to_shifted_col_names(condition):
-        bracket_contents = re.findall(r'\[n([+-]?\d+)\]', condition)
-        groups = re.findall(r'(\w+\[n[+-]?\d+\])', condition)
-        shift_dict = {group: group.split('[')[0] + '_shifted_' + bracket_content.replace('-', 'm').replace('+', '')
-                      for group, bracket_content in zip(groups, bracket_contents)}
-        for group, shifted_col_name in shift_dict.items():
-            condition = condition.replace(group, shifted_col_name)
-        return condition, shift_dict
-
-    df_condition = df.copy()
-    condition_string, shift_dict = translate_n_to_shifted_col_names(condition)
-    for original, shifted_col_name in shift_dict.items():
-        col = original.split('[')[0]
-        shift = -int(re.findall(r'\[n([+-]?\d+)\]', original)[0])  # Negate the shift to align with Python's shift behavior
-        df_condition[shifted_col_name] = df[col].shift(shift)
-
-    # Handling string comparisons separately
-    eval_condition = re.sub(r"\s*==\s*'(\w+)'\s*", r" == '\1' ", condition_string)
-    mask = df_condition.eval(eval_condition)
+    # Copy the DataFrame so that the original remains unchanged (lazily, if copy-on-write is on)
+    if not inplace:
+        df = _copy_unless_cow(df)
+
+    condition_string, shift_items = _translate_n_to_shifted_col_names(condition)
+    shift_dict = dict(shift_items)
+
+    # Purely numeric conditions go through the numba kernel (large frames) or numexpr
+    mask = _numeric_condition_mask(df, condition_string, shift_dict)
+
+    if mask is None:
+        # The shifted columns are handed to eval as extra names rather than added to a copy of df
+        shifted_columns = {}
+        for original, shifted_col_name in shift_dict.items():
+            col = original.split('[')[0]
+            shift = -int(_N_OFFSET_RE.findall(original)[0])  # Negate the shift to align with Python's shift behavior
+            shifted_columns[shifted_col_name] = df[col].shift(shift)
+
+        # Handling string comparisons separately
+        eval_condition = _QUOTED_EQUALS_RE.sub(r" == '\1' ", condition_string)
+        mask = df.eval(eval_condition, resolvers=(shifted_columns,))
     
     if isinstance(new_value, str) and '[n' in new_value:
-        new_value_shift = -int(re.findall(r'\[n([+-]?\d+)\]', new_value)[0])  # Negate the shift to align with Python's shift behavior
-        new_value = re.sub(r'\[n([+-]?\d+)\]', '', new_value)
+        new_value_shift = -int(_N_OFFSET_RE.findall(new_value)[0])  # Negate the shift to align with Python's shift behavior
+        new_value = _N_OFFSET_RE.sub('', new_value)
         new_value = df[new_value].shift(new_value_shift)
 
     if isinstance(new_value, str) and new_value in df.columns:
         new_value = df[new_value]
 
-    original_column = df[column].copy()
+    original_column = df[column].to_numpy(copy=True)
     df.loc[mask, column] = new_value
-    replaced_count = (df[column] != original_column).sum()
+
+    # Only rows matching the condition can have changed, so compare just those.
+    # A missing value replaced by a missing value is not a real change.
+    rows = np.asarray(mask, dtype=bool)
+    before = original_column[rows]
+    after = df[column].to_numpy()[rows]
+    before_missing, after_missing = pd.isna(before), pd.isna(after)
+    both_present = ~before_missing & ~after_missing
+    replaced_count = int((before_missing != after_missing).sum() + (before[both_present] != after[both_present]).sum())
 
     print(f'({replaced_count} real changes made)')
     return df
@@ -223,7 +617,35 @@ def replace(df, column, new_value, condition):
 
 
 
-def how_is_this_not_a_duplicate(df, unique_cols, new_col_name='problematic_cols'):
+def _problematic_cols_polars(df, unique_cols):
+    """
+    Polars implementation of how_is_this_not_a_duplicate's comparison.
+
+    Parameters:
+    df (DataFrame): Input DataFrame
+    unique_cols (list of str): Columns that should uniquely identify a row
+
+    Returns:
+    numpy.ndarray: For each row, the comma-separated columns whose values vary within its group ('' if none)
+    """
+    import polars as pl
+
+    # Positional names avoid clashes and non-string labels
+    names = [f'col_{i}' for i in range(df.shape[1])]
+    key_names = [names[df.columns.get_loc(c)] for c in unique_cols]
+    frame = pl.from_pandas(df.set_axis(names, axis=1))
+
+    # A column is problematic for a group if it holds more than one distinct value (missing counts as a value)
+    labels = [pl.when(pl.col(n).n_unique().over(key_names) > 1).then(pl.lit(str(c))) for n, c in zip(names, df.columns)]
+    is_duplicate = pl.len().over(key_names) > 1
+    result = frame.select(pl.when(is_duplicate).then(pl.concat_str(labels, separator=', ', ignore_nulls=True))
+                          .otherwise(pl.lit('')).fill_null('').alias('problematic'))
+    return result['problematic'].to_numpy()
+
+
+
+
+def how_is_this_not_a_duplicate(df, unique_cols, new_col_name='problematic_cols', engine='pandas'):
     """
     Identify columns that differ between the rows for a given combination of identifiers.
     Overwrites the existing problematic_cols column if it exists.
@@ -232,9 +654,11 @@ def how_is_this_not_a_duplicate(df, unique_cols, new_col_name='problematic_cols'
     df (DataFrame): Input DataFrame
     unique_cols (list of str or str): Columns that should uniquely identify a row
     new_col_name (str, optional): Name of the new column to be added. Default is 'problematic_cols'.
+    engine (str, optional): 'pandas' or 'polars'. The polars engine needs polars installed. Default is 'pandas'.
     
     Returns:
-    DataFrame: DataFrame with an additional column, containing a list of columns preventing the row from being labeled a duplicate.
+    DataFrame: DataFrame with an additional column, containing a list of columns preventing the row from being labeled a duplicate,
+        i.e. the columns whose values vary within the row's group. Missing values are treated as equal to each other.
     
     Example:
     >>> df = pd.DataFrame({'ID': [1, 1], 'Name': ['Alice', 'Alice'], 'Age': [25, np.nan]})
@@ -245,42 +669,97 @@ def how_is_this_not_a_duplicate(df, unique_cols, new_col_name='problematic_cols'
     if not isinstance(unique_cols, list):
         unique_cols = [unique_cols]
     
+    if engine not in ('pandas', 'polars'):
+        raise ValueError("engine must be either 'pandas' or 'polars'")
+
     # If the new column already exists, drop it
     if new_col_name in df.columns:
         df.drop(columns=[new_col_name], inplace=True)
+
+    if engine == 'polars':
+        # sort_values makes the only copy needed; the shallow copy just keeps the new column off the input
+        result_df = df.copy(deep=False)
+        result_df[new_col_name] = _problematic_cols_polars(df, unique_cols)
+        return result_df.sort_values(by=unique_cols)
     
+    # The result is returned sorted, and sort_values already returns a new DataFrame, so it doubles as the result
     df = df.sort_values(by=unique_cols)
     df_unique_cols_no_nan = df[unique_cols].fillna('')
 
     duplicates = df_unique_cols_no_nan.duplicated(keep=False)
-    result_df = df.copy()
-    result_df[new_col_name] = ''
-    
-    for idx in df[duplicates].index.tolist():
-        row = df.loc[idx]
-        other_rows = df.loc[duplicates & (df_unique_cols_no_nan == df_unique_cols_no_nan.loc[idx]).all(axis=1)]
-        other_rows = other_rows[other_rows.index != idx]
-        
-        if not other_rows.empty:
-            # Check if a column has differing values, considering NaN to be the same as NaN
-            cols_diff = ', '.join(
-                col for col in df.columns 
-                if (
-                    (not pd.isna(row[col]) or not pd.isna(other_rows[col].iloc[0])) and 
-                    (row[col] != other_rows[col].iloc[0])
-                )
-            )
-            
-            if cols_diff:
-                result_df.at[idx, new_col_name] = cols_diff
+
+    # A column is problematic for a group if it holds more than one distinct value (missing counts as a value)
+    groups = df.groupby([df_unique_cols_no_nan[col] for col in unique_cols], sort=False)
+    differs = groups.transform('nunique', dropna=False).gt(1).to_numpy()
+
+    # Join the names of the problematic columns for every row at once: multiplying the boolean mask by
+    # the 'name, ' strings keeps the names where True, and the matrix product concatenates them
+    labels = differs.astype(object).dot(np.array([f'{col}, ' for col in df.columns], dtype=object))
+    df[new_col_name] = np.where(duplicates.to_numpy(), pd.Series(labels, index=df.index, dtype=object).str[:-2], '')
     
-    return result_df
+    return df
 
 
 
 
-def bysort_sequence(df, group_cols, new_col_name, sequence_type='_n'):
-    
+def _bysort_sequence_polars(df, group_cols, new_col_name, sequence_type, presorted):
+    """
+    Polars implementation of bysort_sequence; see bysort_sequence for the parameters.
+    """
+    import polars as pl
+
+    # Only the key columns go through polars; positional names avoid clashes and non-string labels
+    key_names = [f'key_{i}' for i in range(len(group_cols))]
+    keys = pl.from_pandas(df[group_cols].set_axis(key_names, axis=1)).with_row_index('row')
+    if not presorted:
+        keys = keys.sort(key_names, maintain_order=True, nulls_last=True)
+
+    if sequence_type == '_n':
+        sequence = pl.int_range(pl.len()).over(key_names) + 1
+    else:
+        sequence = pl.len().over(key_names)
+    # As in pandas, rows with a missing group key get no sequence value
+    has_missing_key = pl.any_horizontal(pl.col(key_names).is_null())
+    result = keys.select('row', pl.when(has_missing_key).then(None).otherwise(sequence.cast(pl.Int64)).alias('sequence'))
+
+    # Reorder the full pandas DataFrame once, keeping its index and dtypes
+    df = df.take(result['row'].to_numpy())
+    df[new_col_name] = result['sequence'].to_numpy()
+    return df
+
+
+
+
+def _group_codes(keys):
+    """
+    Number the groups formed by the key columns with pd.factorize, which is much faster than groupby's
+    ngroup, especially for categorical keys.
+
+    Parameters:
+    keys (pd.DataFrame): The group key columns
+
+    Returns:
+    np.ndarray: Group number (int64) of each row, or -1 if any of its keys is missing.
+    """
+    codes = None
+    valid = np.ones(len(keys), dtype=bool)
+    for col in keys.columns:
+        col_codes, uniques = pd.factorize(keys[col])
+        col_codes = col_codes.astype(np.int64, copy=False)
+        valid &= col_codes != -1
+        if codes is None:
+            codes = col_codes
+        else:
+            # Combine with the codes so far, then renumber so the codes stay below len(keys) and can't overflow
+            codes, _ = pd.factorize(codes * len(uniques) + col_codes)
+    codes[~valid] = -1
+    return codes
+
+
+
+
+def bysort_sequence(df, group_cols, new_col_name, sequence_type='_n', shrink=False, presorted=False, engine='pandas'):
+
     """
     Function to generate a sequence number (_n) or the maximum number (_N) within each group of the specified columns.
 
@@ -289,24 +768,59 @@ def bysort_sequence(df, group_cols, new_col_name, sequence_type='_n'):
     group_cols (list): The columns to sort and group by.
     new_col_name (str): The name of the new column that will hold the sequence or max number.
     sequence_type (str): The type of sequence, either '_n' for a sequence number or '_N' for the max number in a sequence.
+    shrink (bool): If True, downcast the new column to the smallest integer type that fits. Defaults to False.
+    presorted (bool): If True, the DataFrame is assumed to already be sorted by group_cols and is not re-sorted. Defaults to False.
+    engine (str): 'pandas' or 'polars'. The polars engine needs polars installed and sorts stably. Defaults to 'pandas'.
 
     Returns:
     pandas.DataFrame: The DataFrame with the new column.
     """
-    
-    # Sort
-    df = df.sort_values(group_cols)
-    
-    # Check the type of sequence required       
-    if sequence_type == '_n':
-        # If '_n' is specified, generate a sequence number for each group
-        df[new_col_name] = df.groupby(group_cols).cumcount() + 1
-    elif sequence_type == '_N':
-        # If '_N' is specified, generate the maximum number in the sequence for each group
-        df[new_col_name] = df.groupby(group_cols)[group_cols[-1]].transform('count')
+    if engine not in ('pandas', 'polars'):
+        raise ValueError("engine must be either 'pandas' or 'polars'")
+
+    if engine == 'polars' and sequence_type in ('_n', '_N'):
+        # Sort and number the rows in polars
+        df = _bysort_sequence_polars(df, group_cols, new_col_name, sequence_type, presorted)
     else:
-        # If an invalid sequence_type is given, print an error message
-        print("Invalid sequence_type. Choose either '_n' for a sequence number or '_N' for the max number in a sequence.")
+        # Sort and group on categorical copies of object keys so that strings are compared once,
+        # when the categories are built, and integer codes after that; df keeps its own dtypes
+        keys = df[group_cols].copy(deep=False)
+        for col in group_cols:
+            if keys[col].dtype == object:
+                keys[col] = keys[col].astype('category')
+
+        # Sort, unless the caller has already done so
+        if not presorted:
+            order = keys.reset_index(drop=True).sort_values(group_cols).index.to_numpy()
+            df = df.take(order)
+            keys = keys.take(order)
+        else:
+            df = _copy_unless_cow(df)  # Don't add the new column to, or share data with, the caller's DataFrame
+
+        # Check the type of sequence required
+        if sequence_type == '_n':
+            # If '_n' is specified, generate a sequence number for each group
+            df[new_col_name] = keys.groupby(group_cols, observed=True).cumcount() + 1
+        elif sequence_type == '_N':
+            # If '_N' is specified, generate the maximum number in the sequence for each group
+            # Count rows per group in a single pass by histogramming the group numbers
+            codes = _group_codes(keys)
+            valid = codes != -1  # Rows with a missing group key have no group number
+            counts = np.bincount(codes[valid])
+            if valid.all():
+                df[new_col_name] = counts[codes]
+            else:
+                group_size = np.full(len(df), np.nan)
+                group_size[valid] = counts[codes[valid]]
+                df[new_col_name] = group_size
+        else:
+            # If an invalid sequence_type is given, print an error message
+            print("Invalid sequence_type. Choose either '_n' for a sequence number or '_N' for the max number in a sequence.")
+
+    # Optionally downcast the new column to save memory
+    if shrink and new_col_name in df.columns:
+        df = _shrink(df, columns=[new_col_name])
+
     # Return the DataFrame with the new column
     return df
 
@@ -318,15 +832,180 @@ def bysort_sequence(df, group_cols, new_col_name, sequence_type='_n'):
 
 ###############################################################################
 def convert_to_units(row, length, unit, conversion_dict):
+    """
+    Convert a measurement to a different unit, for use with df.apply(convert_to_units, axis=1, ...).
+
+    Applying this row by row runs Python once per row; prefer convert_to_units_vec, which converts the whole
+    column at once. Passing a whole DataFrame as row does that for you.
+
+    Parameters:
+    row (pd.Series or pd.DataFrame): A row of the DataFrame, or the whole DataFrame
+    length (str): Column with the measurement
+    unit (str): Column with the unit of the measurement
+    conversion_dict (dict): Conversion factor for each unit
+
+    Returns:
+    The converted measurement (0 if the unit is missing), or a Series of them if row is a DataFrame.
+    """
+    if isinstance(row, pd.DataFrame):
+        return convert_to_units_vec(row, length, unit, conversion_dict)
     if pd.isna(row[unit]):
         return 0
     else:
         return row[length] * conversion_dict[row[unit]]
 
 
+def convert_to_units_vec(df, length, unit, conversion_dict):
+    """
+    Vectorized version of convert_to_units: converts a whole column at once instead of being
+    applied row by row with df.apply(convert_to_units, axis=1, ...).
 
+    Parameters:
+    df (pd.DataFrame): DataFrame holding the measurements
+    length (str): Column with the measurements
+    unit (str): Column with the unit of each measurement
+    conversion_dict (dict): Conversion factor for each unit
+
+    Returns:
+    pd.Series: The converted measurements; 0 where the unit is missing.
 
-def count_occurrences_with_offset(df, column, string_to_find, offset=1, inplace=False, new_column_name=None):
+    Raises:
+    KeyError: If a unit isn't in conversion_dict
+
+    Example:
+    >>> df = pd.DataFrame({'length': [1, 2, 3], 'unit': ['ft', 'in', None]})
+    >>> convert_to_units_vec(df, 'length', 'unit', {'ft': 12, 'in': 1})
+    0    12.0
+    1     2.0
+    2     0.0
+    dtype: float64
+    """
+    units = df[unit]
+    missing = units.isna()
+    unknown = ~missing & ~units.isin(list(conversion_dict))
+    if unknown.any():
+        raise KeyError(units[unknown].iloc[0])
+
+    # Look the factors up once per row with a hash map, then multiply the columns
+    converted = df[length] * units.map(conversion_dict)
+    return converted.mask(missing, 0)
+
+
+
+
+# Characters that give a pattern a regex meaning beyond a plain substring
+_REGEX_META_RE = re.compile(r'[.^$*+?{}\[\]\\|()]')
+
+
+def _as_arrow_str(series):
+    """
+    Convert a Series of strings to the pyarrow-backed string dtype, whose string methods run in Arrow's
+    vectorized kernels instead of looping over Python objects.
+
+    Parameters:
+    series (pd.Series): Series of strings (missing values allowed)
+
+    Returns:
+    pd.Series or None: The Series as 'string[pyarrow]' (or unchanged if it already is), or None if pyarrow
+        isn't installed or the Series holds non-string values.
+    """
+    if isinstance(series.dtype, pd.StringDtype) and series.dtype.storage == 'pyarrow':
+        return series
+    try:
+        import pyarrow as pa
+    except ImportError:
+        return None
+    try:
+        # Unlike astype, this fails on non-string values rather than converting them to strings
+        arr = pa.array(series.to_numpy(), type=pa.large_string(), from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return None
+    return pd.Series(pd.arrays.ArrowStringArray(arr), index=series.index, name=series.name)
+
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _count_byte(data, offsets, byte):
+        """Count the occurrences of one byte in each string of an Arrow string array's data buffer."""
+        n = offsets.shape[0] - 1
+        out = np.empty(n, dtype=np.int64)
+        for i in prange(n):
+            count = 0
+            for k in range(offsets[i], offsets[i + 1]):
+                if data[k] == byte:
+                    count += 1
+            out[i] = count
+        return out
+
+    @njit(cache=True)
+    def _any_contains(data, offsets, needle):
+        """Whether any string of an Arrow string array contains the needle, stopping at the first match."""
+        m = needle.shape[0]
+        first = needle[0]
+        for i in range(offsets.shape[0] - 1):
+            for k in range(offsets[i], offsets[i + 1] - m + 1):
+                if data[k] == first:
+                    j = 1
+                    while j < m and data[k + j] == needle[j]:
+                        j += 1
+                    if j == m:
+                        return True
+        return False
+
+
+def _count_substring(series, string_to_find):
+    """
+    Count literal occurrences of a substring with pyarrow's vectorized substring kernel.
+
+    Parameters:
+    series (pd.Series): Object-dtype or StringDtype Series of strings
+    string_to_find (str): Literal substring to count
+
+    Returns:
+    pd.Series or None: Counts per row, with the same dtype Series.str.count gives (NaN for missing values in
+        object columns, nullable Int64 for StringDtype), or None if the fast path doesn't apply (regex pattern,
+        other dtypes, non-string values or pyarrow not installed).
+    """
+    if not string_to_find or _REGEX_META_RE.search(string_to_find):
+        return None
+    nullable = isinstance(series.dtype, pd.StringDtype)
+    if series.dtype != object and not nullable:
+        return None
+    arrow = _as_arrow_str(series)
+    if arrow is None:
+        return None
+
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    arr = pa.array(arrow)
+    if isinstance(arr, pa.ChunkedArray):
+        arr = arr.combine_chunks()
+    missing = arr.is_null().to_numpy(zero_copy_only=False) if arr.null_count else None
+
+    if (njit is not None and pa.types.is_large_string(arr.type) and len(arr) >= _NUMBA_MIN_ROWS
+            and len(string_to_find) == 1 and string_to_find.isascii()):
+        # A single ASCII character is a single byte that can't occur inside any other UTF-8 character,
+        # so count it directly in the concatenated UTF-8 data between each string's offsets
+        offsets = np.frombuffer(arr.buffers()[1], dtype=np.int64)[arr.offset:arr.offset + len(arr) + 1]
+        data = np.frombuffer(arr.buffers()[2], dtype=np.uint8)
+        counts = _count_byte(data, offsets, np.uint8(ord(string_to_find)))
+    else:
+        counts = pc.count_substring(arr, string_to_find).fill_null(0).to_numpy().astype(np.int64, copy=False)
+
+    if nullable:
+        # StringDtype's str.count returns nullable integers
+        mask = missing if missing is not None else np.zeros(len(counts), dtype=bool)
+        return pd.Series(pd.arrays.IntegerArray(counts, mask), index=series.index)
+    if missing is not None:
+        # Nulls come back as NaN, matching Series.str.count
+        counts = counts.astype(np.float64)
+        counts[missing] = np.nan
+    return pd.Series(counts, index=series.index)
+
+
+
+
+def count_occurrences_with_offset(df, column, string_to_find, offset=1, inplace=False, new_column_name=None, shrink=False):
     """
     This function counts the occurrences of a given string in each row of a specified column in a dataframe, adds an offset, 
     and appends the results as a new column to the dataframe. Optionally, it can perform the operation in-place.
@@ -339,6 +1018,7 @@ def count_occurrences_with_offset(df, column, string_to_find, offset=1, inplace=
     inplace (bool): If True, appends the results as a new column in the existing dataframe. 
                     If False, returns a new dataframe with the appended results. Defaults to False.
     new_column_name (str): The name of the new column that will hold the counts. If not specified, defaults to "{column}_count".
+    shrink (bool): If True, downcast the new column to the smallest numeric type that fits. Defaults to False.
 
     Returns:
     df (pd.DataFrame): The dataframe with the added column of string occurrence counts (or the original dataframe if inplace=True).
@@ -357,12 +1037,19 @@ def count_occurrences_with_offset(df, column, string_to_find, offset=1, inplace=
     if not new_column_name:
         new_column_name = f"{column}_count"
 
-    # Count occurrences of string_to_find in each row, add offset and store results in new column
-    if inplace:
-        df[new_column_name] = df[column].str.count(string_to_find) + offset
-    else:
-        df = df.copy()
-        df[new_column_name] = df[column].str.count(string_to_find) + offset
+    # Count occurrences of string_to_find in each row, using pyarrow for literal substrings where possible
+    counts = _count_substring(df[column], string_to_find)
+    if counts is None:
+        counts = df[column].str.count(string_to_find)
+
+    # Add offset and store results in new column
+    if not inplace:
+        df = _copy_unless_cow(df)
+    df[new_column_name] = counts + offset
+
+    # Optionally downcast the new column to save memory
+    if shrink:
+        df = _shrink(df, columns=[new_column_name])
 
     return df
 
@@ -390,23 +1077,26 @@ def proper_case(df, column):
     1             None
     2  Another Example
     """
-    def capitalize(text):
-        words = text.split()
-        new_words = []
-        for word in words:
-            word = word.lower()  # Convert to lowercase
-            word = word.capitalize()  # Capitalize the first letter
-            word = re.sub(r"('\w)", lambda m: m.group(1).lower(), word)  # Correct the internal apostrophe
-            new_words.append(word)
-        return ' '.join(new_words)
-    
-    # Apply the capitalize function to each cell in the DataFrame column
-    df[column] = df[column].apply(lambda x: capitalize(str(x)) if pd.notna(x) else x)
+    # Lowercasing a word and capitalizing it already leaves the letter after an
+    # internal apostrophe lowercase, so each cell is exactly string.capwords.
+    # str.title is not used: it would also capitalize after digits and hyphens.
+    values = df[column]
+    if values.dtype == object and pd.api.types.infer_dtype(values, skipna=True) == 'string':
+        # Columns of names and categories repeat a lot, so convert each distinct string once and
+        # spread the results back with a take; missing values (code -1) are kept as they were
+        codes, uniques = pd.factorize(values)
+        converted = np.array([string.capwords(x) for x in uniques] + [None], dtype=object)
+        result = converted[codes]
+        missing = codes == -1
+        result[missing] = values.to_numpy()[missing]
+        df[column] = pd.Series(result, index=values.index, name=values.name)
+    else:
+        df[column] = values.map(lambda x: string.capwords(str(x)), na_action='ignore')
     return df
 
 
 
-def df_slice(df, start_pct, end_pct):
+def df_slice(df, start_pct, end_pct, copy=False):
     """
     Get a slice of a DataFrame based on a percentage range.
     
@@ -414,21 +1104,179 @@ def df_slice(df, start_pct, end_pct):
     - df (DataFrame): The DataFrame to slice.
     - start_pct (float): The starting percentage of the DataFrame slice.
     - end_pct (float): The ending percentage of the DataFrame slice.
+    - copy (bool): If True, return an independent copy of the slice. Defaults to False.
 
     Returns:
-    - DataFrame: A DataFrame slice based on the percentage range.
+    - DataFrame: A DataFrame slice based on the percentage range. Unless copy is True, the slice shares
+      its data with df rather than copying it, so don't modify it in place.
     """
     total_length = len(df)
     start_index = int(total_length * start_pct)
     end_index = int(total_length * end_pct)
-    print(f"Dataframe sliced to start at {start_index} and end at {end_index}.")
-    return df.iloc[start_index:end_index]
+    logger.debug("Dataframe sliced to start at %d and end at %d.", start_index, end_index)
+    sliced = df.iloc[start_index:end_index]
+    return sliced.copy() if copy else sliced
+
+
+
+
+
+def _append_row(data, row_values, row_name):
+    """
+    Append one row of values to a numeric DataFrame or Series using a single allocation.
+
+    Parameters:
+    data (pd.DataFrame or pd.Series): Data to append to
+    row_values (array-like or scalar): Values of the new row (one per column for a DataFrame)
+    row_name: Index label of the new row
+
+    Returns:
+    pd.DataFrame or pd.Series or None: The extended data, or None if data has mixed or non-numeric
+        dtypes, in which case the caller should fall back to pd.concat.
+    """
+    dtypes = set(data.dtypes) if isinstance(data, pd.DataFrame) else {data.dtype}
+    if len(dtypes) != 1:
+        return None
+    dtype = dtypes.pop()
+    if not isinstance(dtype, np.dtype) or dtype.kind not in 'iuf':
+        return None
+
+    values = np.asarray(row_values)
+    arr = data.to_numpy()
+
+    # Allocate the result once and fill it in place
+    out = np.empty((arr.shape[0] + 1,) + arr.shape[1:], dtype=np.result_type(arr.dtype, values.dtype))
+    out[:-1] = arr
+    out[-1] = values
+
+    index = data.index.append(pd.Index([row_name]))
+    if isinstance(data, pd.Series):
+        return pd.Series(out, index=index)
+    return pd.DataFrame(out, index=index, columns=data.columns)
+
+
+
+
+def _top_positions(key, num_rows, descending):
+    """
+    Find the positions of the num_rows top rows (sorted by key) using a partial partition,
+    which is O(n) instead of the O(n log n) of a full sort.
+
+    Parameters:
+    key (pd.Series): Values to rank the rows by
+    num_rows (int): Number of top rows to keep
+    descending (bool): Whether the top rows are the largest (True) or smallest (False) values
+
+    Returns:
+    tuple or None: (positions of the top rows in sorted order, boolean mask of the top rows), or None if
+        a full sort should be used instead (non-numeric or missing values, or nothing to partition).
+    """
+    if not isinstance(key, pd.Series) or not isinstance(key.dtype, np.dtype) or key.dtype.kind not in 'iuf':
+        return None
+    values = key.to_numpy()
+    n = len(values)
+    if not 0 < num_rows < n or (values.dtype.kind == 'f' and np.isnan(values).any()):
+        return None
+
+    # Partition to find the cutoff value, then take every row beyond it plus the earliest rows tied with it,
+    # which are the same rows a stable sort would put first
+    if descending:
+        cutoff = np.partition(values, n - num_rows)[n - num_rows]
+        beyond = values > cutoff
+    else:
+        cutoff = np.partition(values, num_rows - 1)[num_rows - 1]
+        beyond = values < cutoff
+    ties = np.flatnonzero(values == cutoff)[:num_rows - int(beyond.sum())]
+    top = np.sort(np.concatenate([np.flatnonzero(beyond), ties]))
+
+    # Sort only the top rows
+    if descending:
+        # Sort the reversed values and reverse back, so ties keep their original order as in sort_values
+        order = num_rows - 1 - np.argsort(values[top][::-1], kind='stable')[::-1]
+    else:
+        order = np.argsort(values[top], kind='stable')
+    top = top[order]
+
+    in_top = np.zeros(n, dtype=bool)
+    in_top[top] = True
+    return top, in_top
+
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _partial_column_sums(values, skip):
+        """Sum each column of a 2-D array in blocks of rows, leaving out the rows flagged in skip and NaN."""
+        n, ncols = values.shape
+        chunk = 4096
+        nchunks = (n + chunk - 1) // chunk
+        partial = np.zeros((nchunks, ncols))
+        for c in prange(nchunks):
+            for i in range(c * chunk, min(n, (c + 1) * chunk)):
+                if not skip[i]:
+                    for j in range(ncols):
+                        v = values[i, j]
+                        if not np.isnan(v):
+                            partial[c, j] += v
+        return partial
+
+
+def _sum_excluding(data, in_top):
+    """
+    Sum the rows of data that are not in the top rows with the numba kernel, without first copying them out.
 
+    Parameters:
+    data (pd.DataFrame or pd.Series): Data to sum
+    in_top (np.ndarray): Boolean mask of the rows to leave out
+
+    Returns:
+    pd.Series or float or None: Column sums (DataFrame) or the sum (Series), skipping NaN as pandas does,
+        or None if the data isn't all float64, is too small, or numba isn't installed.
+    """
+    if njit is None or len(data) < _NUMBA_MIN_ROWS:
+        return None
+    dtypes = set(data.dtypes) if isinstance(data, pd.DataFrame) else {data.dtype}
+    if dtypes != {np.dtype(np.float64)}:
+        return None
+
+    values = data.to_numpy()
+    if values.ndim == 1:
+        values = values[:, np.newaxis]
+    # Adding up the per-block totals with numpy keeps the rounding error close to that of pandas' sum
+    sums = _partial_column_sums(values, in_top).sum(axis=0)
+    if isinstance(data, pd.Series):
+        return sums[0]
+    return pd.Series(sums, index=data.columns)
+
+
+
+
+def _sort_order_polars(keys, descending):
+    """
+    Positions that sort the rows of keys, found with polars.
 
+    Parameters:
+    keys (pd.DataFrame): The columns to sort by
+    descending (bool): Whether to sort in descending order
+
+    Returns:
+    np.ndarray: Row positions in sorted order. As in sort_values, missing values come last and ties
+        keep their original order.
+    """
+    import polars as pl
+
+    # Positional names avoid clashes and non-string labels
+    key_names = [f'key_{i}' for i in range(keys.shape[1])]
+    ranked = (pl.from_pandas(keys.set_axis(key_names, axis=1)).lazy()
+              .with_row_index('row')
+              .sort(key_names, descending=descending, nulls_last=True, maintain_order=True)
+              .select('row')
+              .collect())
+    return ranked['row'].to_numpy()
 
 
 
-def add_other_row(data, num_rows, new_row_name="Other", sort_column=None, sort_descending=True):
+
+def add_other_row(data, num_rows, new_row_name="Other", sort_column=None, sort_descending=True, engine='pandas'):
     """
     Modifies the input DataFrame or Series by appending an 'Other' row or item.
     
@@ -446,6 +1294,8 @@ def add_other_row(data, num_rows, new_row_name="Other", sort_column=None, sort_d
     - sort_column: Optional; for DataFrames, the column name to sort by before processing. For Series,
       any truthy value triggers sorting by values. Defaults to None.
     - sort_descending: Optional; boolean indicating if sorting should be in descending order. Defaults to True.
+    - engine: Optional; 'pandas' or 'polars'. The polars engine sorts with polars (which needs to be installed)
+      and sorts stably. Defaults to 'pandas'.
     
     Returns:
     - The modified DataFrame or Series with the new 'Other' row/item.
@@ -456,21 +1306,64 @@ def add_other_row(data, num_rows, new_row_name="Other", sort_column=None, sort_d
     >>> s = pd.Series([5, 1, 3, 2, 4])
     >>> add_other_row(s, 3, sort_column=True)  # Here, sort_column just needs to be truthy for a Series.
     """
+    if engine not in ('pandas', 'polars'):
+        raise ValueError("engine must be either 'pandas' or 'polars'")
+
     if isinstance(data, pd.Series):
-        if sort_column:  # If sort_column is truthy, sort the Series.
-            data = data.sort_values(ascending=not sort_descending)
-        top_items = data.iloc[:num_rows]
-        others_sum = data.iloc[num_rows:].sum()
-        # Use pd.concat to combine the top items with the 'Other' sum
-        result = pd.concat([top_items, pd.Series([others_sum], index=[new_row_name])])
+        # If sort_column is truthy, only the top items need to be found and sorted
+        split = None
+        others_sum = None
+        if sort_column and engine == 'polars':
+            order = _sort_order_polars(data.to_frame(), sort_descending)
+            split = data.take(order[:num_rows]), data.take(order[num_rows:])
+        elif sort_column:
+            top = _top_positions(data, num_rows, sort_descending)
+            if top is not None:
+                top_positions, in_top = top
+                # The numba kernel sums the other items in place; otherwise they are selected and summed below
+                others_sum = _sum_excluding(data, in_top)
+                split = data.take(top_positions), (data[~in_top] if others_sum is None else None)
+        if split is not None:
+            top_items, other_items = split
+        else:
+            if sort_column:  # If sort_column is truthy, sort the Series.
+                data = data.sort_values(ascending=not sort_descending, kind='stable')
+            top_items = data.iloc[:num_rows]
+            other_items = data.iloc[num_rows:]
+        if others_sum is None:
+            others_sum = other_items.sum()
+        # Build numeric results in one allocation, otherwise use pd.concat to combine the top items with the 'Other' sum
+        result = _append_row(top_items, others_sum, new_row_name)
+        if result is None:
+            result = pd.concat([top_items, pd.Series([others_sum], index=[new_row_name])])
     elif isinstance(data, pd.DataFrame):
-        if sort_column:
-            data = data.sort_values(by=sort_column, ascending=not sort_descending)
-        top_rows = data.iloc[:num_rows, :]
-        others_sum = data.iloc[num_rows:, :].sum(numeric_only=True)
-        others_row = pd.DataFrame([others_sum], index=[new_row_name])
-        # Use pd.concat to append 'Other' row to the DataFrame
-        result = pd.concat([top_rows, others_row])
+        # When sorting by a single column, only the top rows need to be found and sorted
+        split = None
+        others_sum = None
+        if sort_column and engine == 'polars':
+            order = _sort_order_polars(data[sort_column if isinstance(sort_column, list) else [sort_column]], sort_descending)
+            split = data.take(order[:num_rows]), data.take(order[num_rows:])
+        elif sort_column is not None and not isinstance(sort_column, list) and sort_column in data.columns:
+            top = _top_positions(data[sort_column], num_rows, sort_descending)
+            if top is not None:
+                top_positions, in_top = top
+                # The numba kernel sums the other rows in place; otherwise they are selected and summed below
+                others_sum = _sum_excluding(data, in_top)
+                split = data.take(top_positions), (data[~in_top] if others_sum is None else None)
+        if split is not None:
+            top_rows, other_rows = split
+        else:
+            if sort_column:
+                data = data.sort_values(by=sort_column, ascending=not sort_descending, kind='stable')
+            top_rows = data.iloc[:num_rows, :]
+            other_rows = data.iloc[num_rows:, :]
+        if others_sum is None:
+            others_sum = other_rows.sum(numeric_only=True)
+        # Build numeric results in one allocation, otherwise use pd.concat to append 'Other' row to the DataFrame
+        result = _append_row(top_rows, others_sum.to_numpy(), new_row_name)
+        if result is None:
+            others_row = pd.DataFrame([others_sum], index=[new_row_name])
+            result = pd.concat([top_rows, others_row])
     else:
         raise ValueError("Input must be a pandas DataFrame or Series")
     
@@ -501,20 +1394,47 @@ def add_total_row(data, total_row_name='Total'):
     """
     if isinstance(data, pd.Series):
         total_sum = data.sum()
-        # Use pd.concat to append 'Total' item to the Series
-        result = pd.concat([data, pd.Series([total_sum], index=[total_row_name])])
+        # Build numeric results in one allocation, otherwise use pd.concat to append 'Total' item to the Series
+        result = _append_row(data, total_sum, total_row_name)
+        if result is None:
+            result = pd.concat([data, pd.Series([total_sum], index=[total_row_name])])
     elif isinstance(data, pd.DataFrame):
         total_sum = data.sum(numeric_only=True)
-        # Create a DataFrame for the 'Total' row to maintain dtype consistency
-        total_row = pd.DataFrame([total_sum], index=[total_row_name])
-        # Use pd.concat to append 'Total' row to the DataFrame
-        result = pd.concat([data, total_row], ignore_index=False)
+        # Build numeric results in one allocation
+        result = _append_row(data, total_sum.to_numpy(), total_row_name)
+        if result is None:
+            # Create a DataFrame for the 'Total' row to maintain dtype consistency
+            total_row = pd.DataFrame([total_sum], index=[total_row_name])
+            # Use pd.concat to append 'Total' row to the DataFrame
+            result = pd.concat([data, total_row], ignore_index=False)
     else:
         raise ValueError("Input must be a pandas DataFrame or Series")
     
     return result
 
 
+def _row_positions(index, label):
+    """
+    Find the positions of the rows with a given label, as df.loc[[label]] selects them.
+
+    On a MultiIndex, a label for the leading level(s) matches every row under it.
+
+    Parameters:
+    index (pd.Index): Index to search
+    label: Row label
+
+    Returns:
+    np.ndarray: Positions of the matching rows in index order (empty if there are none)
+    """
+    if isinstance(index, pd.MultiIndex):
+        try:
+            return index.get_locs(label if isinstance(label, tuple) else [label])
+        except (KeyError, IndexError):  # IndexError: a tuple longer than the number of levels
+            return np.array([], dtype=np.intp)
+    positions = index.get_indexer_for([label])
+    return positions[positions != -1]
+
+
 def move_row(df, row_to_move, pos='last', ref_row=None):
     """
     Move a row in a DataFrame to a specified position without altering the original index.
@@ -531,64 +1451,389 @@ def move_row(df, row_to_move, pos='last', ref_row=None):
     """
     # Ensure handling of both integer-based and label-based indices
     if isinstance(row_to_move, int) and isinstance(df.index, pd.RangeIndex):
-        row_label = df.index[row_to_move]
+        # An integer on a RangeIndex is already a position, so no label lookup is needed
+        moving = np.array([range(len(df))[row_to_move]])
     else:
-        row_label = row_to_move
-    
-    # Extract the row to be moved
-    row = df.loc[[row_label]]
-    
-    # Drop the row from its current position
-    df_copy = df.drop(row_label)
-    
+        moving = _row_positions(df.index, row_to_move)
+        if len(moving) == 0:
+            raise KeyError(f"{row_to_move!r} not in index")
+
+    # Positions of all remaining rows
+    rest = np.delete(np.arange(len(df)), moving)
+
+    # Find the slot among the remaining rows where the row should be inserted
     if pos == 'first':
-        # Concatenate the row at the beginning
-        new_df = pd.concat([row, df_copy], sort=False)
+        slot = 0
     elif pos == 'last':
-        # Concatenate the row at the end
-        new_df = pd.concat([df_copy, row], sort=False)
+        slot = len(rest)
     elif (pos == 'before' or pos == 'after') and ref_row is not None:
-        # Find the insertion point for 'before' or 'after'
-        all_rows = df_copy.index.tolist()
-        ref_index = all_rows.index(ref_row)
-        if pos == 'before':
-            new_index = all_rows[:ref_index] + [row_label] + all_rows[ref_index:]
-        else:  # pos == 'after'
-            new_index = all_rows[:ref_index + 1] + [row_label] + all_rows[ref_index + 1:]
-        new_df = df.reindex(new_index)
+        # Look ref_row up in the full index rather than building a new index of the remaining rows,
+        # then shift its position down by the number of moved rows that come before it
+        ref_positions = _row_positions(df.index, ref_row)
+        ref_positions = ref_positions[~np.isin(ref_positions, moving)]
+        if len(ref_positions) == 0:
+            raise ValueError(f"{ref_row!r} is not in list")
+        ref_position = ref_positions[0] - np.count_nonzero(moving < ref_positions[0])
+        slot = ref_position if pos == 'before' else ref_position + 1
     elif isinstance(pos, int):
-        # Handle integer position
-        all_rows = df_copy.index.tolist()
-        all_rows.insert(pos, row_label)
-        new_df = df.reindex(all_rows)
+        # Handle integer position with the same semantics as list.insert
+        slot = max(len(rest) + pos, 0) if pos < 0 else min(pos, len(rest))
     else:
-        new_df = df  # If position not recognized, return original DataFrame
+        return df  # If position not recognized, return original DataFrame
+
+    # Gather all rows in their new order in a single pass
+    new_df = df.take(np.concatenate([rest[:slot], moving, rest[slot:]]))
     
     return new_df
 
 
 
 
-def find_columns_with_substring(df, substring, case_sensitive=True):
+# Rows searched at a time by find_columns_with_substring, so that a column can stop at its first match
+_CONTAINS_CHUNK_ROWS = 65_536
+
+
+@lru_cache(maxsize=None)
+def _is_arrow_str(dtype):
+    """
+    Whether a dtype stores its strings in pyarrow: 'string[pyarrow]' or an ArrowDtype of (large_)string.
+
+    Cached per dtype, since wide frames repeat the same few dtypes across many columns.
+    """
+    if isinstance(dtype, pd.StringDtype):
+        return dtype.storage in ('pyarrow', 'pyarrow_numpy')
+    if isinstance(dtype, pd.ArrowDtype):
+        import pyarrow as pa
+        return pa.types.is_string(dtype.pyarrow_dtype) or pa.types.is_large_string(dtype.pyarrow_dtype)
+    return False
+
+
+def _arrow_contains(arrow, substring, case_sensitive):
+    """
+    Literal substring test on a pyarrow-backed string Series, run directly in Arrow's match_substring
+    kernel rather than through the pandas string accessor.
+
+    Missing values count as the text '<NA>', which is what astype(str) turns them into.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    arr = pa.array(arrow.array)
+    # A case-sensitive match of a UTF-8 needle is a plain byte match within one string's bytes, which numba scans
+    # without building a boolean array and stops at the first hit
+    needle = None
+    if njit is not None and case_sensitive and substring:
+        needle = np.frombuffer(substring.encode('utf-8'), dtype=np.uint8)
+
+    for chunk in (arr.chunks if isinstance(arr, pa.ChunkedArray) else [arr]):
+        if needle is not None and len(chunk) >= _NUMBA_MIN_ROWS and not chunk.null_count:
+            offset_type = np.int64 if pa.types.is_large_string(chunk.type) else np.int32
+            offsets = np.frombuffer(chunk.buffers()[1], dtype=offset_type)[chunk.offset:chunk.offset + len(chunk) + 1]
+            data = np.frombuffer(chunk.buffers()[2], dtype=np.uint8)
+            hit = _any_contains(data, offsets, needle)
+        else:
+            hit = pc.any(pc.match_substring(chunk, substring, ignore_case=not case_sensitive)).as_py()
+        if hit:
+            return True
+    if arr.null_count:
+        return substring in '<NA>' if case_sensitive else substring.lower() in '<na>'
+    return False
+
+
+def _column_contains(column, substrings, case_sensitive, where=None):
+    """
+    Check which substrings occur in at least one value of a column, as text.
+
+    The column is searched in chunks of rows, stopping once every substring has been found, so matches
+    near the top are found without converting and searching the whole column. Each chunk is converted
+    to text once and shared by all the substrings.
+
+    Parameters:
+    column (pd.Series): The column to search
+    substrings (list of str): The substrings to search for; those with regex characters are treated as regexes
+    case_sensitive (bool): Whether the search is case sensitive
+    where (np.ndarray, optional): Boolean array of the rows to search; each chunk is filtered with it before searching
+
+    Returns:
+    list of bool: For each substring, True if at least one value contains it.
+    """
+    # Skip the regex engine for substrings that have no regex meaning
+    regexes = [bool(_REGEX_META_RE.search(substring)) for substring in substrings]
+    found = [False] * len(substrings)
+
+    # Columns holding only strings (no missing values) are searched as they are instead of being copied with astype(str);
+    # literal searches go through pyarrow's substring kernel when it is installed. Columns that are already
+    # pyarrow-backed strings are searched in place even with missing values.
+    # Only object and string dtypes can hold nothing but strings, so other columns skip infer_dtype's scan
+    arrow_backed = _is_arrow_str(column.dtype)
+    only_strings = arrow_backed or (
+        (column.dtype == object or isinstance(column.dtype, pd.StringDtype))
+        and pd.api.types.infer_dtype(column, skipna=False) == 'string' and not column.hasnans)
+
+    for start in range(0, len(column), _CONTAINS_CHUNK_ROWS):
+        if all(found):
+            break
+        chunk = column.iloc[start:start + _CONTAINS_CHUNK_ROWS]
+        if where is not None:
+            chunk = chunk[where[start:start + _CONTAINS_CHUNK_ROWS]]
+        arrow = None
+        if not only_strings:
+            chunk = chunk.astype(str)
+        elif arrow_backed:
+            arrow = chunk
+            # Regexes see missing values as '<NA>' text, as for any other column
+            if column.hasnans and any(regex and not done for regex, done in zip(regexes, found)):
+                chunk = chunk.astype(str)
+        elif not all(regexes):
+            arrow = _as_arrow_str(chunk)
+
+        for i, (substring, regex) in enumerate(zip(substrings, regexes)):
+            if found[i]:
+                continue
+            if arrow is not None and not regex:
+                found[i] = _arrow_contains(arrow, substring, case_sensitive)
+            else:
+                found[i] = bool(chunk.str.contains(substring, case=case_sensitive, regex=regex).any())
+    return found
+
+
+def _row_mask(df, where):
+    """Convert an optional where= row mask to a boolean numpy array, checking it has one value per row of df."""
+    if where is None:
+        return None
+    where = np.asarray(where, dtype=bool)
+    if where.shape != (len(df),):
+        raise ValueError(f"where must be a boolean mask with one value per row ({len(df)}), got shape {where.shape}")
+    return where
+
+
+def _search_columns(df, substrings, case_sensitive, where=None):
+    """
+    Run _column_contains on every column of df, in parallel threads when there are several columns and CPUs.
+
+    Returns:
+    list of list of bool: For each column, whether it contains each substring.
+    """
+    where = _row_mask(df, where)
+
+    def contains(col):
+        return _column_contains(df[col], substrings, case_sensitive, where)
+
+    # pyarrow's substring kernels release the GIL, so the threads search columns in parallel
+    if len(df.columns) > 1 and (os.cpu_count() or 1) > 1:
+        with ThreadPoolExecutor() as executor:
+            return list(executor.map(contains, df.columns))
+    return [contains(col) for col in df.columns]
+
+
+def find_columns_with_substring(df, substring, case_sensitive=True, where=None):
     """
     Returns a list of column names where at least one value in the column contains the specified substring.
 
     Args:
     df (pd.DataFrame): The DataFrame to search through.
-    substring (str): The substring to search for in the column values.
+    substring (str): The substring to search for in the column values. Treated as a regex if it contains regex characters.
+    where (array-like of bool, optional): Only search the rows where this mask is True. Same result as searching
+        df[where], without copying the whole DataFrame first.
 
     Returns:
     list: A list of column names where values contain the substring.
     """
-    # Adjust case sensitivity in the search
-    if case_sensitive:
-        matching_columns = [col for col in df.columns if df[col].astype(str).str.contains(substring).any()]
-    else:
-        matching_columns = [col for col in df.columns if df[col].astype(str).str.contains(substring, case=False).any()]
+    found = _search_columns(df, [substring], case_sensitive, where)
+    matching_columns = [col for col, has_substring in zip(df.columns, found) if has_substring[0]]
     return matching_columns
 
 
+def iter_columns_with_substring(df, substring, case_sensitive=True, where=None):
+    """
+    Lazily yield the names of columns where at least one value contains the specified substring.
 
+    Columns are searched one at a time, in order, only as the caller asks for the next name, so callers that just
+    need to know whether any column matches can stop at the first hit.
+
+    Args:
+    df (pd.DataFrame): The DataFrame to search through.
+    substring (str): The substring to search for in the column values. Treated as a regex if it contains regex characters.
+    case_sensitive (bool): Whether the search is case sensitive. Defaults to True.
+    where (array-like of bool, optional): Only search the rows where this mask is True, as in find_columns_with_substring.
+
+    Yields:
+    The name of each column whose values contain the substring.
+
+    Example:
+    >>> first = next(iter_columns_with_substring(df, 'error'), None)
+    """
+    where = _row_mask(df, where)
+    for col in df.columns:
+        if _column_contains(df[col], [substring], case_sensitive, where)[0]:
+            yield col
+
+
+def find_columns_with_substrings(df, substrings, case_sensitive=True, where=None):
+    """
+    Find the columns containing each of several substrings in a single pass over the data.
+
+    Equivalent to calling find_columns_with_substring once per substring, but each column is read and
+    converted to text once rather than once per substring.
+
+    Args:
+    df (pd.DataFrame): The DataFrame to search through.
+    substrings (list of str): The substrings to search for. Each is treated as a regex if it contains regex characters.
+    case_sensitive (bool): Whether the search is case sensitive. Defaults to True.
+    where (array-like of bool, optional): Only search the rows where this mask is True, as in find_columns_with_substring.
+
+    Returns:
+    dict: Maps each substring to the list of column names where values contain it.
+
+    Example:
+    >>> df = pd.DataFrame({'a': ['apple', 'kiwi'], 'b': ['pear', 'plum'], 'c': [1.5, 2.0]})
+    >>> find_columns_with_substrings(df, ['p', 'kiwi', '.5'])
+    {'p': ['a', 'b'], 'kiwi': ['a'], '.5': ['c']}
+    """
+    found = _search_columns(df, list(substrings), case_sensitive, where)
+    return {substring: [col for col, has_substrings in zip(df.columns, found) if has_substrings[i]]
+            for i, substring in enumerate(substrings)}
+
+
+
+
+# ##############################################################################
+# Deferred chains of the functions above
+# ##############################################################################
+
+def _run_column_ops(df, ops):
+    """
+    Run a sequence of column-only operations (renames and moves) with a single pass over the data.
+
+    The operations are replayed on a one-row stand-in whose values are the original column positions,
+    so only the final column order and names have to be applied to df.
+
+    Parameters:
+    df (pd.DataFrame): DataFrame to operate on
+    ops (list of tuple): (function, args, kwargs) for each operation
+
+    Returns:
+    pd.DataFrame: DataFrame with the operations applied
+    """
+    stand_in = pd.DataFrame([np.arange(df.shape[1])], columns=df.columns)
+    for func, args, kwargs in ops:
+        stand_in = func(stand_in, *args, **kwargs)
+
+    positions = stand_in.iloc[0].to_numpy()
+    if len(positions) == df.shape[1] and (positions == np.arange(df.shape[1])).all():
+        df = df.copy(deep=False)  # Only the names changed, so the data can be shared
+    else:
+        df = df.take(positions, axis=1)
+    df.columns = stand_in.columns
+    return df
+
+
+def _run_row_ops(df, ops):
+    """
+    Run a sequence of row moves with a single gather of the data.
+
+    Parameters:
+    df (pd.DataFrame): DataFrame to operate on
+    ops (list of tuple): (function, args, kwargs) for each operation
+
+    Returns:
+    pd.DataFrame: DataFrame with the rows in their final order
+    """
+    stand_in = pd.DataFrame({'position': np.arange(len(df))}, index=df.index)
+    for func, args, kwargs in ops:
+        stand_in = func(stand_in, *args, **kwargs)
+    return df.take(stand_in['position'].to_numpy())
+
+
+class LazyWrangler:
+    """
+    Queue wrangling functions on a DataFrame and run them together with collect().
+
+    Each method takes the same arguments as the function of the same name (without the DataFrame),
+    queues it and returns the LazyWrangler, so calls can be chained. collect() works on a single copy of
+    the DataFrame (made lazily under copy-on-write), which is left unchanged, and runs consecutive column
+    renames/moves and consecutive row moves as one operation each, so they copy the data once rather than
+    once per call.
+
+    Example:
+    >>> df = pd.DataFrame({'A': [1, 2, 3], 'B': [4, 5, 6], 'C': [7, 8, 9]})
+    >>> (LazyWrangler(df)
+    ...     .rename_columns(['A', 'B'], ['a', 'b'])
+    ...     .move_column('C', 'first')
+    ...     .move_row(2, 'first')
+    ...     .collect())
+       C  a  b
+    2  9  3  6
+    0  7  1  4
+    1  8  2  5
+    """
+
+    def __init__(self, df):
+        self._df = df
+        self._ops = []
+
+    def _queue(self, func, args, kwargs):
+        self._ops.append((func, args, kwargs))
+        return self
+
+    def rename_columns(self, *args, **kwargs):
+        return self._queue(rename_columns, args, kwargs)
+
+    def move_column(self, *args, **kwargs):
+        return self._queue(move_column, args, kwargs)
+
+    def move_row(self, *args, **kwargs):
+        return self._queue(move_row, args, kwargs)
+
+    def replace(self, *args, **kwargs):
+        return self._queue(replace, args, kwargs)
+
+    def bysort_sequence(self, *args, **kwargs):
+        return self._queue(bysort_sequence, args, kwargs)
+
+    def how_is_this_not_a_duplicate(self, *args, **kwargs):
+        return self._queue(how_is_this_not_a_duplicate, args, kwargs)
+
+    def count_occurrences_with_offset(self, *args, **kwargs):
+        return self._queue(count_occurrences_with_offset, args, kwargs)
+
+    def proper_case(self, *args, **kwargs):
+        return self._queue(proper_case, args, kwargs)
+
+    def df_slice(self, *args, **kwargs):
+        return self._queue(df_slice, args, kwargs)
+
+    def add_other_row(self, *args, **kwargs):
+        return self._queue(add_other_row, args, kwargs)
+
+    def add_total_row(self, *args, **kwargs):
+        return self._queue(add_total_row, args, kwargs)
+
+    def collect(self):
+        """
+        Run the queued operations.
+
+        Returns:
+        pd.DataFrame: The DataFrame with every queued operation applied.
+        """
+        def kind(op):
+            if op[0] in (rename_columns, move_column):
+                return 'columns'
+            if op[0] is move_row:
+                return 'rows'
+            return None
+
+        df = _copy_unless_cow(self._df)  # Functions that modify their input only touch this copy
+        for op_kind, run in itertools.groupby(self._ops, key=kind):
+            run = list(run)
+            if op_kind == 'columns':
+                df = _run_column_ops(df, run)
+            elif op_kind == 'rows':
+                df = _run_row_ops(df, run)
+            else:
+                for func, args, kwargs in run:
+                    df = func(df, *args, **kwargs)
+        return df
 
 
 
@@ -613,15 +1858,18 @@ Same is true with any other monkey-patched method.
 
 import pandas as pd
 
-def values_and_percent(self, decimals=2):
+def values_and_percent(self, decimals=2, lazy=False):
     """
     Calculate the value counts and corresponding percentages of the Series.
 
     Parameters:
         decimals (int, optional): Number of decimal places to round the percentages to. Default is 2.
+        lazy (bool, optional): If True, return the raw arrays instead of building a DataFrame. Cheaper when called
+            once per group in a groupby loop and only the numbers are needed. Default is False.
 
     Returns:
         pd.DataFrame: A DataFrame with counts and percentages.
+        If lazy, a SimpleNamespace with counts and percentages (numpy arrays) and index (the values counted).
 
     Example:
 
@@ -639,8 +1887,45 @@ def values_and_percent(self, decimals=2):
     C      1        16.7
     """
     counts = self.value_counts(dropna=False)
-    percentages = (counts / len(self) * 100).round(decimals)
-    return pd.DataFrame({'Count': counts, 'Percentage': percentages})
+    # Work on the raw counts array so the arithmetic doesn't build intermediate Series
+    count_values = counts.to_numpy()
+    percentages = np.round(count_values / len(self) * 100, decimals)
+    if lazy:
+        return SimpleNamespace(counts=count_values, percentages=percentages, index=counts.index)
+    return pd.DataFrame({'Count': count_values, 'Percentage': percentages}, index=counts.index)
+
+
+class ValuesAndPercentAccessor:
+    """
+    Series accessor exposing values_and_percent as s.vp.report(), through pandas' extension API rather than
+    a monkey-patched method. pandas caches the accessor object on each Series.
+
+    Example:
+
+    >>> pd.Series(['A', 'B', 'A']).vp.report(decimals=1)
+       Count  Percentage
+    A      2        66.7
+    B      1        33.3
+    """
+    def __init__(self, series):
+        self._series = series
+
+    def report(self, decimals=2, lazy=False):
+        return values_and_percent(self._series, decimals=decimals, lazy=lazy)
+
+
+def _unset_or_ours(name):
+    """Whether pd.Series has no attribute name, or only one set by this module (e.g. before importlib.reload)."""
+    return not hasattr(pd.Series, name) or getattr(getattr(pd.Series, name), '__module__', None) == __name__
+
+
+# Register this module's definitions, replacing those of an earlier import; a pandas attribute of the same
+# name is left alone
+if _unset_or_ours('vp'):
+    if hasattr(pd.Series, 'vp'):
+        delattr(pd.Series, 'vp')  # Re-registering over it would warn about overriding an attribute
+    pd.api.extensions.register_series_accessor('vp')(ValuesAndPercentAccessor)
 
-# Extend the pandas Series class to include this method
-pd.Series.values_and_percent = values_and_percent
+# Keep s.values_and_percent() working for existing callers
+if _unset_or_ours('values_and_percent'):
+    pd.Series.values_and_percent = values_and_percent
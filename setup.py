@@ -1,5 +1,20 @@
 from setuptools import setup, find_packages
 
+# Third-party imports of the modules beyond wrangling_functions, one extra per module, so they are only
+# installed for the parts you use, e.g. pip install "pywrangling[scraping,aws]"
+extras_require = {
+    'scraping': ['selenium', 'PyJWT'],  # scraping_functions
+    'parsing': ['beautifulsoup4'],  # parsing_functions
+    'geo': ['geopandas', 'geopy', 'googlemaps', 'cartopy', 'shapely', 'matplotlib'],  # gis_functions
+    'aws': ['boto3', 'matplotlib', 'python-dateutil'],  # s3_functions
+    'db': ['mariadb'],  # sql_functions
+    'ai': ['openai'],  # gpt_functions
+    'utility': ['pytz'],  # utility_functions
+    # Optional accelerators picked up by wrangling_functions when installed
+    'fast': ['numba', 'numexpr', 'pyarrow', 'polars'],
+}
+extras_require['all'] = sorted({package for packages in extras_require.values() for package in packages})
+
 setup(
     name="pywrangling",
     version="0.42.3.1",
@@ -7,19 +22,7 @@ setup(
     install_requires=[
         'pandas',
         'numpy',
-        'tqdm',
-        'geopandas',
-        'geopy',
-        'googlemaps',
-        'matplotlib',
-        'openai',
-        'scipy',
-        'selenium',
-        'selenium-wire',
-        'boto3',
-        'pymysql',
-        'sqlalchemy',
-        'PyJWT',
-        'pyodbc'
+        'tqdm'
     ],
+    extras_require=extras_require,
 )
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import pywrangling.wrangling_functions as wf
+
+
+def eager_other_row(data, num_rows, sort_column, sort_descending):
+    """add_other_row as plain pandas: a stable sort, the top rows, and the sum of the rest."""
+    if isinstance(data, pd.Series):
+        ordered = data.sort_values(ascending=not sort_descending, kind='stable')
+        return pd.concat([ordered.iloc[:num_rows], pd.Series([ordered.iloc[num_rows:].sum()], index=['Other'])])
+    ordered = data.sort_values(by=sort_column, ascending=not sort_descending, kind='stable')
+    other = ordered.iloc[num_rows:].sum(numeric_only=True).rename('Other')
+    return pd.concat([ordered.iloc[:num_rows], other.to_frame().T])
+
+
+@pytest.fixture
+def ties():
+    # Many tied values, so an unstable sort would pick different rows
+    return pd.DataFrame({'a': [5, 1, 3, 3, 4, 2] * 3, 'b': np.arange(18.0)})
+
+
+@pytest.mark.parametrize('sort_descending', [True, False])
+@pytest.mark.parametrize('num_rows', [1, 2, 5, 17])
+def test_ties_match_stable_sort(ties, num_rows, sort_descending):
+    # A single column goes through the partial partition, a list of columns and NaN keys through the full sort
+    with_nan = ties.astype({'a': float})
+    with_nan.loc[17, 'a'] = np.nan
+    for data, sort_column in [(ties, 'a'), (ties, ['a']), (with_nan, 'a')]:
+        result = wf.add_other_row(data, num_rows, sort_column=sort_column, sort_descending=sort_descending)
+        expected = eager_other_row(data, num_rows, sort_column, sort_descending)
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+@pytest.mark.parametrize('sort_descending', [True, False])
+def test_series(ties, sort_descending):
+    s = ties['a']
+    with_nan = s.astype(float)
+    with_nan[17] = np.nan
+    for data in [s, with_nan]:
+        result = wf.add_other_row(data, 5, sort_column=True, sort_descending=sort_descending)
+        pd.testing.assert_series_equal(result, eager_other_row(data, 5, True, sort_descending), check_dtype=False)
+
+
+@pytest.mark.parametrize('sort_descending', [True, False])
+def test_polars_engine_matches_pandas(ties, sort_descending):
+    pytest.importorskip('polars')
+    for data, sort_column in [(ties, 'a'), (ties['a'], True)]:
+        expected = wf.add_other_row(data, 5, sort_column=sort_column, sort_descending=sort_descending)
+        result = wf.add_other_row(data, 5, sort_column=sort_column, sort_descending=sort_descending, engine='polars')
+        if isinstance(data, pd.Series):
+            pd.testing.assert_series_equal(result, expected)
+        else:
+            pd.testing.assert_frame_equal(result, expected)
+
+
+def test_input_is_left_alone(ties):
+    original = ties.copy()
+    wf.add_other_row(ties, 5, sort_column='a')
+    wf.add_other_row(ties['a'], 5, sort_column=True)
+    pd.testing.assert_frame_equal(ties, original)
+
+
+def test_large_float_frame():
+    # Large enough for the numba sum of the other rows
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(20_000, 3)), columns=['a', 'b', 'c'])
+    result = wf.add_other_row(df, 10, sort_column='a')
+    pd.testing.assert_frame_equal(result, eager_other_row(df, 10, 'a', True))
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import pywrangling.wrangling_functions as wf
+
+
+@pytest.fixture
+def df():
+    rng = np.random.default_rng(0)
+    n = 1_000
+    return pd.DataFrame({
+        'g': rng.choice(['x', 'y', 'z', None], n),
+        'h': rng.integers(0, 5, n),
+        'v': rng.normal(size=n),
+    })
+
+
+def eager_sequence(df, group_cols, sequence_type):
+    """bysort_sequence as plain pandas: a stable sort, then cumcount or group size."""
+    expected = df.sort_values(group_cols, kind='stable')
+    grouped = expected.groupby(group_cols)
+    if sequence_type == '_n':
+        expected['seq'] = grouped.cumcount() + 1
+    else:
+        expected['seq'] = grouped['v'].transform('size')
+    return expected
+
+
+@pytest.mark.parametrize('sequence_type', ['_n', '_N'])
+def test_matches_pandas(df, sequence_type):
+    df = df.dropna()
+    result = wf.bysort_sequence(df, ['g', 'h'], 'seq', sequence_type)
+    pd.testing.assert_frame_equal(result, eager_sequence(df, ['g', 'h'], sequence_type), check_dtype=False)
+
+
+@pytest.mark.parametrize('sequence_type', ['_n', '_N'])
+def test_presorted_matches_sorted(df, sequence_type):
+    ordered = df.sort_values(['g', 'h'], kind='stable')
+    result = wf.bysort_sequence(ordered, ['g', 'h'], 'seq', sequence_type, presorted=True)
+    pd.testing.assert_frame_equal(result, wf.bysort_sequence(ordered, ['g', 'h'], 'seq', sequence_type))
+
+
+@pytest.mark.parametrize('presorted', [False, True])
+def test_caller_frame_is_left_alone(df, presorted):
+    original = df.copy()
+    result = wf.bysort_sequence(df, ['g', 'h'], 'seq', '_N', presorted=presorted)
+    assert 'seq' not in df.columns
+    result.loc[result.index[0], 'v'] = 1e9
+    pd.testing.assert_frame_equal(df, original)
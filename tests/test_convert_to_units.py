@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import pywrangling.wrangling_functions as wf
+
+CONVERSIONS = {'ft': 12, 'in': 1, 'yd': 36.0}
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        'length': [1, 2.5, 3, np.nan, 4, np.nan, 0] * 50,
+        'unit': ['ft', 'in', None, 'yd', np.nan, None, 'ft'] * 50,
+    }, index=np.arange(350)[::-1] * 2)
+
+
+def test_matches_row_wise_apply(df):
+    expected = df.apply(wf.convert_to_units, axis=1, length='length', unit='unit', conversion_dict=CONVERSIONS)
+    result = wf.convert_to_units_vec(df, 'length', 'unit', CONVERSIONS)
+    pd.testing.assert_series_equal(result, expected, check_dtype=False)
+    # Passing the whole DataFrame to convert_to_units goes through the vectorized version
+    pd.testing.assert_series_equal(wf.convert_to_units(df, 'length', 'unit', CONVERSIONS), result)
+
+
+def test_missing_unit_is_zero(df):
+    result = wf.convert_to_units_vec(df, 'length', 'unit', CONVERSIONS)
+    assert (result[df['unit'].isna()] == 0).all()
+
+
+def test_unknown_unit(df):
+    df.loc[df.index[3], 'unit'] = 'mi'
+    with pytest.raises(KeyError):
+        df.apply(wf.convert_to_units, axis=1, length='length', unit='unit', conversion_dict=CONVERSIONS)
+    with pytest.raises(KeyError, match='mi'):
+        wf.convert_to_units_vec(df, 'length', 'unit', CONVERSIONS)
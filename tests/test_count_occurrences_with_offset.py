@@ -0,0 +1,37 @@
+import pandas as pd
+import pytest
+
+import pywrangling.wrangling_functions as wf
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        'instruments': ['Euphonium; Trombone', 'Trumpet', None, 'Percussion; Euphonium; Clarinet', ''] * 200,
+        'n': range(1000),
+    })
+
+
+@pytest.mark.parametrize('string_to_find, offset', [(';', 1), ('Euphonium', 0), ('u', 2), (r'[;,]', 1)])
+def test_matches_str_count(df, string_to_find, offset):
+    expected = df.copy()
+    expected['instruments_count'] = df['instruments'].str.count(string_to_find) + offset
+    result = wf.count_occurrences_with_offset(df, 'instruments', string_to_find, offset)
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+@pytest.mark.parametrize('copy_on_write', [False, True])
+def test_caller_frame_is_left_alone(df, copy_on_write):
+    original = df.copy()
+    with pd.option_context('mode.copy_on_write', copy_on_write):
+        result = wf.count_occurrences_with_offset(df, 'instruments', ';')
+        assert 'instruments_count' not in df.columns
+        # Writes to the existing columns of the result must not reach the input
+        result.loc[0, ['instruments', 'n']] = ['Tuba', -1]
+        pd.testing.assert_frame_equal(df, original)
+
+
+def test_inplace(df):
+    result = wf.count_occurrences_with_offset(df, 'instruments', ';', inplace=True, new_column_name='parts')
+    assert result is df
+    assert df['parts'].iloc[:2].tolist() == [2, 1]
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import pywrangling.wrangling_functions as wf
+
+
+def eager_find(df, substrings, case_sensitive=True):
+    """find_columns_with_substrings as plain pandas: every column converted to text and searched whole."""
+    text = {col: df[col].astype(str) for col in df.columns}
+    return {substring: [col for col in df.columns if text[col].str.contains(substring, case=case_sensitive).any()]
+            for substring in substrings}
+
+
+@pytest.fixture
+def df(monkeypatch):
+    # Several search chunks (each still long enough for the numba scan), with the matches near the end, and
+    # missing values of each kind
+    monkeypatch.setattr(wf, '_CONTAINS_CHUNK_ROWS', 12_000)
+    n = 30_000
+    words = np.array(['apple', 'Kiwi', 'pear', 'plum'], dtype=object)
+    df = pd.DataFrame({
+        'fruit': words[np.arange(n) % 4],
+        'mixed': pd.Series(['none'] * n, dtype=object),
+        'num': np.arange(n) / 4,
+        'arrow': pd.Series(['a-b'] * n, dtype='string[pyarrow]'),
+        'cat': pd.Categorical(['x', 'y'] * (n // 2)),
+    })
+    df.loc[n - 1, 'fruit'] = 'dragon fruit 42'
+    df.loc[n - 2, 'mixed'] = None
+    df.loc[n - 3, 'mixed'] = 'Apple|Pie'
+    df.loc[n - 4, 'arrow'] = None
+    return df
+
+
+SUBSTRINGS = ['apple', 'APPLE', 'kiwi', 'dragon', 'nan', 'None', '<NA>', 'a-b', '.25', r'\d+', '^p', 'e|z', 'y', 'zzz']
+
+
+@pytest.mark.parametrize('case_sensitive', [True, False])
+def test_matches_pandas(df, case_sensitive):
+    expected = eager_find(df, SUBSTRINGS, case_sensitive)
+    assert wf.find_columns_with_substrings(df, SUBSTRINGS, case_sensitive=case_sensitive) == expected
+    for substring in SUBSTRINGS:
+        assert wf.find_columns_with_substring(df, substring, case_sensitive) == expected[substring], substring
+
+
+@pytest.mark.parametrize('case_sensitive', [True, False])
+def test_where(df, case_sensitive):
+    where = (np.arange(len(df)) % 3 == 0) & (np.arange(len(df)) < len(df) - 4)
+    expected = eager_find(df[where], SUBSTRINGS, case_sensitive)
+    assert wf.find_columns_with_substrings(df, SUBSTRINGS, case_sensitive=case_sensitive, where=where) == expected
+
+
+def test_where_must_have_one_value_per_row(df):
+    with pytest.raises(ValueError):
+        wf.find_columns_with_substrings(df, ['apple'], where=[True, False])
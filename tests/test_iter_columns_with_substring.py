@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import pywrangling.wrangling_functions as wf
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        'a': ['apple', 'kiwi', None],
+        'b': [1.5, 2.0, np.nan],
+        'c': pd.Series(['pear', None, 'Apple'], dtype='string[pyarrow]'),
+        'd': ['plum', 'fig', 'date'],
+    })
+
+
+@pytest.mark.parametrize('substring', ['p', 'apple', 'APPLE', '.5', r'\d', 'nan', 'None', '<NA>', 'zzz'])
+@pytest.mark.parametrize('case_sensitive', [True, False])
+def test_matches_find_columns_with_substring(df, substring, case_sensitive):
+    expected = wf.find_columns_with_substring(df, substring, case_sensitive)
+    assert list(wf.iter_columns_with_substring(df, substring, case_sensitive)) == expected
+    first = next(wf.iter_columns_with_substring(df, substring, case_sensitive), None)
+    assert first == (expected[0] if expected else None)
+
+
+def test_where(df):
+    where = [True, False, True]
+    expected = wf.find_columns_with_substring(df, 'p', where=where)
+    assert list(wf.iter_columns_with_substring(df, 'p', where=where)) == expected
+
+
+def test_stops_at_first_match(df, monkeypatch):
+    searched = []
+    contains = wf._column_contains
+
+    def recording(column, *args):
+        searched.append(column.name)
+        return contains(column, *args)
+
+    monkeypatch.setattr(wf, '_column_contains', recording)
+    assert next(wf.iter_columns_with_substring(df, 'pear')) == 'c'
+    assert searched == ['a', 'b', 'c']
@@ -0,0 +1,66 @@
+import pandas as pd
+import pytest
+
+import pywrangling.wrangling_functions as wf
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        'A': [1, 2, 3, 4],
+        'B': [4.0, 5.0, 6.0, 7.0],
+        'C': ["JASON'S HaT", 'x; y', None, 'ANOTHER EXAMPLE'],
+    }, index=['p', 'q', 'r', 's'])
+
+
+def eager(df, ops):
+    """Run each queued call directly, as the function of the same name, on a copy of df."""
+    df = df.copy()
+    for name, args, kwargs in ops:
+        df = getattr(wf, name)(df, *args, **kwargs)
+    return df
+
+
+def lazy(df, ops):
+    wrangler = wf.LazyWrangler(df)
+    for name, args, kwargs in ops:
+        wrangler = getattr(wrangler, name)(*args, **kwargs)
+    return wrangler.collect()
+
+
+CHAINS = [
+    [('rename_columns', (['A', 'B'], ['a', 'b']), {})],
+    [('rename_columns', (['A'],), {'prefix': 'x_'}), ('rename_columns', (['x_A'], ['y']), {})],
+    [('move_column', ('C', 'first'), {}), ('rename_columns', (['A', 'B'], ['a', 'b']), {}),
+     ('move_column', ('a', 'after'), {'ref_col': 'b'})],
+    [('move_row', ('r', 'first'), {}), ('move_row', ('p', 'before'), {'ref_row': 's'}), ('move_row', ('q', 1), {})],
+    [('proper_case', ('C',), {})],
+    [('move_column', ('C', 'first'), {}), ('proper_case', ('C',), {}), ('move_row', ('s', 'first'), {}),
+     ('replace', ('B', 0.0, 'A > 2'), {}), ('count_occurrences_with_offset', ('C', ';'), {}),
+     ('rename_columns', (['A'], ['a']), {})],
+    [('bysort_sequence', (['A'], 'seq'), {}), ('add_total_row', (), {})],
+]
+
+
+@pytest.mark.parametrize('ops', CHAINS)
+def test_matches_eager_calls(df, ops):
+    pd.testing.assert_frame_equal(lazy(df, ops), eager(df, ops))
+
+
+@pytest.mark.parametrize('copy_on_write', [False, True])
+@pytest.mark.parametrize('ops', CHAINS)
+def test_input_is_left_alone(df, ops, copy_on_write):
+    original = df.copy()
+    with pd.option_context('mode.copy_on_write', copy_on_write):
+        result = lazy(df, ops)
+        pd.testing.assert_frame_equal(df, original)
+        # Writes to the result must not reach the input, even when only the column names changed
+        result.iloc[0, :] = result.iloc[-1, :]
+        result.iloc[1, 0] = result.iloc[2, 0]
+        pd.testing.assert_frame_equal(df, original)
+
+
+def test_methods_chain(df):
+    wrangler = wf.LazyWrangler(df)
+    assert wrangler.rename_columns(['A'], ['a']) is wrangler
+    pd.testing.assert_frame_equal(wf.LazyWrangler(df).collect(), df)
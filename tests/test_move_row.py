@@ -0,0 +1,78 @@
+import pandas as pd
+import pytest
+
+import pywrangling.wrangling_functions as wf
+
+
+def eager_move_row(df, row_label, pos, ref_row=None):
+    """move_row as plain pandas: take the row(s) out with loc/drop and put them back with concat."""
+    rows = df.loc[[row_label]]
+    rest = df.drop(row_label)
+    if pos == 'first':
+        return pd.concat([rows, rest])
+    if pos == 'last':
+        return pd.concat([rest, rows])
+    if pos in ('before', 'after'):
+        slot = rest.index.get_loc(ref_row) + (pos == 'after')
+    else:
+        slot = pos
+    return pd.concat([rest.iloc[:slot], rows, rest.iloc[slot:]])
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({'x': range(5), 'y': list('abcde')}, index=['p', 'q', 'r', 's', 't'])
+
+
+@pytest.fixture
+def multi():
+    index = pd.MultiIndex.from_tuples([(1, 'a'), (1, 'b'), (2, 'a'), (2, 'b'), (3, 'a')])
+    return pd.DataFrame({'x': range(5)}, index=index)
+
+
+@pytest.mark.parametrize('pos, ref_row', [('first', None), ('last', None), ('before', 'q'), ('after', 'q'),
+                                          ('after', 't'), (0, None), (2, None), (10, None)])
+def test_matches_pandas(df, pos, ref_row):
+    for row in df.index:
+        if row == ref_row:
+            continue
+        pd.testing.assert_frame_equal(wf.move_row(df, row, pos, ref_row), eager_move_row(df, row, pos, ref_row))
+
+
+def test_integer_on_range_index():
+    df = pd.DataFrame({'x': range(4)})
+    pd.testing.assert_frame_equal(wf.move_row(df, 2, 'first'), eager_move_row(df, 2, 'first'))
+    pd.testing.assert_frame_equal(wf.move_row(df, -1, 'first'), eager_move_row(df, 3, 'first'))
+
+
+@pytest.mark.parametrize('row', [2, (2, 'b'), (1, 'a'), 3])
+@pytest.mark.parametrize('pos', ['first', 'last'])
+def test_multiindex_labels(multi, row, pos):
+    # A level-0 label moves every row under it, as df.loc[[2]] selects them
+    pd.testing.assert_frame_equal(wf.move_row(multi, row, pos), eager_move_row(multi, row, pos))
+
+
+def test_multiindex_before_after(multi):
+    result = wf.move_row(multi, 2, 'before', ref_row=(1, 'b'))
+    assert list(result.index) == [(1, 'a'), (2, 'a'), (2, 'b'), (1, 'b'), (3, 'a')]
+    result = wf.move_row(multi, (3, 'a'), 'after', ref_row=1)
+    assert list(result.index) == [(1, 'a'), (3, 'a'), (1, 'b'), (2, 'a'), (2, 'b')]
+    result = wf.move_row(multi, 1, 1)
+    assert list(result.index) == [(2, 'a'), (1, 'a'), (1, 'b'), (2, 'b'), (3, 'a')]
+
+
+def test_missing_labels(df, multi):
+    with pytest.raises(KeyError):
+        wf.move_row(df, 'z', 'first')
+    with pytest.raises(KeyError):
+        wf.move_row(multi, 9, 'first')
+    with pytest.raises(ValueError):
+        wf.move_row(df, 'p', 'before', ref_row='z')
+    with pytest.raises(ValueError):
+        wf.move_row(multi, 2, 'before', ref_row=2)  # ref_row is the row being moved
+
+
+def test_result_is_not_a_slice(df):
+    result = wf.move_row(df, 'r', 'first')
+    with pd.option_context('mode.chained_assignment', 'raise'):
+        result['z'] = 1
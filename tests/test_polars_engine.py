@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import pywrangling.wrangling_functions as wf
+
+pytest.importorskip('polars')
+
+
+@pytest.fixture
+def df():
+    rng = np.random.default_rng(0)
+    n = 1_000
+    df = pd.DataFrame({
+        'g': rng.choice(['x', 'y', 'z', None], n),
+        'h': rng.integers(0, 5, n),
+        'v': rng.integers(0, 3, n).astype(float),
+        'w': rng.choice(['a', 'b'], n),
+    })
+    df.loc[rng.choice(n, 20, replace=False), 'v'] = np.nan
+    return df
+
+
+@pytest.mark.parametrize('sequence_type', ['_n', '_N'])
+@pytest.mark.parametrize('presorted', [False, True])
+def test_bysort_sequence(df, sequence_type, presorted):
+    if presorted:
+        df = df.sort_values(['g', 'h'], kind='stable')
+    expected = wf.bysort_sequence(df, ['g', 'h'], 'seq', sequence_type, presorted=presorted)
+    result = wf.bysort_sequence(df, ['g', 'h'], 'seq', sequence_type, presorted=presorted, engine='polars')
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+@pytest.mark.parametrize('unique_cols', ['g', 'h', ['g', 'h'], ['h', 'w']])
+def test_how_is_this_not_a_duplicate(df, unique_cols):
+    expected = wf.how_is_this_not_a_duplicate(df, unique_cols)
+    result = wf.how_is_this_not_a_duplicate(df, unique_cols, engine='polars')
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_inputs_are_left_alone(df):
+    original = df.copy()
+    wf.bysort_sequence(df, ['g', 'h'], 'seq', '_N', engine='polars')
+    wf.how_is_this_not_a_duplicate(df, ['h'], engine='polars')
+    pd.testing.assert_frame_equal(df, original)
+
+
+def test_unknown_engine(df):
+    with pytest.raises(ValueError):
+        wf.bysort_sequence(df, ['g'], 'seq', engine='dask')
+    with pytest.raises(ValueError):
+        wf.how_is_this_not_a_duplicate(df, ['g'], engine='dask')
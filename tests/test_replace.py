@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import pywrangling.wrangling_functions as wf
+
+
+def eager_replace(df, column, new_value, mask):
+    """replace() as plain pandas: assign new_value where the mask (computed by the caller) is True."""
+    expected = df.copy()
+    expected.loc[mask, column] = new_value
+    return expected
+
+
+@pytest.fixture
+def numeric_df():
+    # Large enough for the numba kernel, with NaNs and negative numbers
+    rng = np.random.default_rng(0)
+    n = 20_000
+    df = pd.DataFrame({'a': rng.integers(-50, 50, n), 'b': rng.normal(size=n), 'c': np.zeros(n)})
+    df.loc[rng.choice(n, 100, replace=False), 'b'] = np.nan
+    return df
+
+
+@pytest.mark.parametrize('condition, mask', [
+    ('a > 10', lambda df: df.a > 10),
+    ('(a >= 0) & (b < 0.5)', lambda df: (df.a >= 0) & (df.b < 0.5)),
+    ('~(a == 3) | (b * 2 > a / 10)', lambda df: ~(df.a == 3) | (df.b * 2 > df.a / 10)),
+    ('a[n-1] < a', lambda df: df.a.shift(1) < df.a),
+    ('b[n+2] > 0', lambda df: df.b.shift(-2) > 0),
+])
+def test_numeric_condition_matches_pandas(numeric_df, condition, mask):
+    result = wf.replace(numeric_df, 'c', 1.0, condition)
+    pd.testing.assert_frame_equal(result, eager_replace(numeric_df, 'c', 1.0, mask(numeric_df)))
+
+
+@pytest.mark.parametrize('dtype', ['int64', 'uint64'])
+def test_integers_beyond_float64_precision(dtype):
+    # 2**53 + 1 rounds to 2**53 in float64, so a float64 comparison would match every row
+    n = 20_000
+    df = pd.DataFrame({'a': np.full(n, 2**53 + 1, dtype=dtype), 'b': np.zeros(n, dtype=np.int64)})
+    for condition in ['a == 9007199254740992', 'a == 9007199254740993', 'a > 9007199254740992']:
+        expected = eager_replace(df, 'b', 1, df.eval(condition))
+        pd.testing.assert_frame_equal(wf.replace(df, 'b', 1, condition), expected)
+
+
+@pytest.mark.parametrize('copy_on_write', [False, True])
+def test_caller_frame_is_left_alone(copy_on_write):
+    df = pd.DataFrame({'a': [1, 2, 3], 'b': [0.0, 0.0, 0.0], 'c': ['x', 'y', 'z']})
+    original = df.copy()
+    with pd.option_context('mode.copy_on_write', copy_on_write):
+        result = wf.replace(df, 'b', 9.0, 'a > 1')
+        # Writes to any column of the result must not reach the input
+        result.loc[0, ['a', 'b', 'c']] = [100, 100.0, 'w']
+        pd.testing.assert_frame_equal(df, original)
+    assert result['b'].tolist() == [100.0, 9.0, 9.0]
+
+
+@pytest.mark.parametrize('condition, mask', [
+    ('a > 10', lambda df: df.a > 10),
+    ('a[n-1] < a', lambda df: df.a.shift(1) < df.a),
+])
+def test_inplace(numeric_df, condition, mask):
+    expected = eager_replace(numeric_df, 'c', 1.0, mask(numeric_df))
+    result = wf.replace(numeric_df, 'c', 1.0, condition, inplace=True)
+    assert result is numeric_df
+    pd.testing.assert_frame_equal(numeric_df, expected)
@@ -0,0 +1,56 @@
+import importlib
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import pywrangling.wrangling_functions as wf
+
+
+def eager_values_and_percent(s, decimals=2):
+    """values_and_percent as plain pandas: value_counts, and the same counts normalized to percentages."""
+    counts = s.value_counts(dropna=False)
+    percentages = (s.value_counts(dropna=False, normalize=True) * 100).round(decimals)
+    return pd.DataFrame({'Count': counts, 'Percentage': percentages}).rename_axis(counts.index.name)
+
+
+@pytest.fixture
+def s():
+    return pd.Series(['A', 'B', 'A', 'C', 'B', 'A', None, np.nan], name='letter')
+
+
+@pytest.mark.parametrize('decimals', [0, 1, 2])
+def test_matches_pandas(s, decimals):
+    expected = eager_values_and_percent(s, decimals)
+    pd.testing.assert_frame_equal(wf.values_and_percent(s, decimals), expected, check_names=False)
+    pd.testing.assert_frame_equal(s.values_and_percent(decimals), expected, check_names=False)
+    pd.testing.assert_frame_equal(s.vp.report(decimals), expected, check_names=False)
+
+
+def test_lazy(s):
+    expected = eager_values_and_percent(s, 1)
+    result = s.vp.report(decimals=1, lazy=True)
+    np.testing.assert_array_equal(result.counts, expected['Count'].to_numpy())
+    np.testing.assert_array_equal(result.percentages, expected['Percentage'].to_numpy())
+    pd.testing.assert_index_equal(result.index, expected.index)
+
+
+def test_reload_registers_the_new_definitions():
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')  # Re-registering 'vp' must not warn about overriding it
+        importlib.reload(wf)
+    assert pd.Series.vp is wf.ValuesAndPercentAccessor
+    assert pd.Series.values_and_percent is wf.values_and_percent
+
+
+def test_reload_leaves_foreign_attributes_alone(monkeypatch):
+    def foreign(self):
+        return 'foreign'
+
+    monkeypatch.setattr(pd.Series, 'values_and_percent', foreign, raising=False)
+    importlib.reload(wf)
+    assert pd.Series.values_and_percent is foreign
+    monkeypatch.undo()
+    importlib.reload(wf)  # Put this module's definition back for the other tests
+    assert pd.Series.values_and_percent is wf.values_and_percent